@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""Measures the memory held per PyFileInfo entry with tracemalloc.
+
+    python benchmarks/memory.py --files 100000 --per-directory 100
+
+Entries are created for a synthetic tree of paths, and then from walking a temporary
+directory of empty files, once bare and once with their type detected.
+"""
+
+from __future__ import absolute_import, print_function
+
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyfileinfo import PyFileInfo  # noqa: E402
+from pyfileinfo.walk import walk  # noqa: E402
+
+
+def synthetic_paths(root, files, per_directory):
+    for idx in range(files):
+        directory = idx // per_directory
+        yield os.path.join(root, 'library', 'season {:03d}'.format(directory % 50),
+                           'disc {:05d}'.format(directory),
+                           'episode {:06d} - title.mkv'.format(idx))
+
+
+def make_tree(root, files, per_directory):
+    for idx in range(0, files, per_directory):
+        directory = os.path.join(root, 'd{:05d}'.format(idx // per_directory))
+        os.mkdir(directory)
+        for name in range(idx, min(files, idx + per_directory)):
+            open(os.path.join(directory, 'file {:06d}.bin'.format(name)), 'wb').close()
+
+
+def measure(build):
+    # Bytes still allocated per entry once build() returned its entries.
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    entries = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return (after - before) / float(len(entries)), len(entries)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=100000)
+    parser.add_argument('--per-directory', type=int, default=100)
+    parser.add_argument('--walk-files', type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    root = os.path.abspath(os.sep + 'media')
+    paths = synthetic_paths(root, args.files, args.per_directory)
+    results = [('PyFileInfo(path)',) + measure(lambda: [PyFileInfo(path) for path in paths])]
+
+    tree = tempfile.mkdtemp()
+    try:
+        make_tree(tree, args.walk_files, args.per_directory)
+        results.append(('walk()',) + measure(lambda: list(walk(tree))))
+
+        def detected():
+            entries = list(walk(tree))
+            for entry in entries:
+                entry.stat()
+                entry.instance
+
+            return entries
+
+        results.append(('walk() + stat + type',) + measure(detected))
+    finally:
+        shutil.rmtree(tree)
+
+    for name, per_entry, count in results:
+        print('{:<24} {:>8.0f} bytes per entry ({} entries)'.format(name, per_entry, count))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
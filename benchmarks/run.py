@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""Runs the benchmarks on a synthetic tree and compares them with a baseline.
+
+    python benchmarks/run.py --scale 0.2 --save-baseline
+    python benchmarks/run.py --scale 0.2 --tolerance 0.25
+
+Results are compared with --baseline, benchmarks/baseline.json by default, when it exists,
+and the exit status is 1 if any of them regressed by more than --tolerance. The baseline
+is only meaningful on the machine, and at the scale, it was saved with.
+"""
+
+from __future__ import absolute_import, print_function
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+from timeit import default_timer
+from collections import OrderedDict
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS))
+
+import memory  # noqa: E402
+import startup  # noqa: E402
+from tree import SAMPLES, make_tree  # noqa: E402
+
+from pyfileinfo import PyFileInfo, Medium  # noqa: E402
+from pyfileinfo.walk import walk  # noqa: E402
+
+
+DEFAULT_BASELINE = os.path.join(BENCHMARKS, 'baseline.json')
+
+
+def run(root, scale, repeat):
+    # Returns {name: (value, unit, 'lower' or 'higher' when that is better)}.
+    results = OrderedDict()
+    layouts = make_tree(root, scale)
+
+    wide = [file.path for file in walk(layouts['wide'])]
+    samples = dict((extension, [path for path in wide if path.endswith(extension)])
+                   for extension in SAMPLES)
+
+    # Backends import their libraries on first use, which isn't what is measured.
+    for paths in samples.values():
+        PyFileInfo(paths[0]).instance
+
+    for extension in sorted(SAMPLES):
+        paths = samples[extension]
+        seconds = _best(lambda: [PyFileInfo(path).instance for path in paths], repeat)
+        results['detect {}'.format(extension)] = (seconds / len(paths) * 1000, 'ms', 'lower')
+
+    mp4 = [path for path in wide if path.endswith('.mp4')][0]
+    results['mediainfo parse'] = (_best(lambda: Medium(mp4).record, repeat) * 1000, 'ms',
+                                  'lower')
+
+    for name in ('wide', 'deep', 'small'):
+        count = len(list(walk(layouts[name])))
+        seconds = _best(lambda: list(walk(layouts[name])), repeat)
+        results['walk {}'.format(name)] = (count / seconds, 'entries/s', 'higher')
+
+    huge = [file.path for file in walk(layouts['huge'])]
+    megabytes = sum(os.path.getsize(path) for path in huge) / 1024.0 / 1024
+    for name, algorithms, use_mmap in (('md5', ['md5'], False),
+                                       ('md5 mmap', ['md5'], True),
+                                       ('md5+sha1+sha256', ['md5', 'sha1', 'sha256'], False)):
+        seconds = _best(lambda: [PyFileInfo(path).hashes(algorithms, use_mmap=use_mmap)
+                                 for path in huge], repeat)
+        results['hash {}'.format(name)] = (megabytes / seconds, 'MB/s', 'higher')
+
+    timings = sorted(startup.measure() for _ in range(max(5, repeat)))
+    results['import'] = (timings[len(timings) // 2], 'ms', 'lower')
+
+    per_entry, _ = memory.measure(lambda: list(walk(layouts['small'])))
+    results['memory walk'] = (per_entry, 'bytes/entry', 'lower')
+    results['peak memory walk'] = (_peak(lambda: list(walk(layouts['small']))) /
+                                   len(list(walk(layouts['small']))), 'bytes/entry', 'lower')
+
+    return results
+
+
+def compare(results, baseline, tolerance):
+    # Returns the names of the results worse than their baseline by more than tolerance.
+    regressions = []
+    for name, (value, _, better) in results.items():
+        if name not in baseline:
+            continue
+
+        base = baseline[name][0]
+        if better == 'lower' and value > base * (1 + tolerance) or \
+                better == 'higher' and value < base * (1 - tolerance):
+            regressions.append(name)
+
+    return regressions
+
+
+def _best(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = default_timer()
+        function()
+        timings.append(default_timer() - start)
+
+    return min(timings)
+
+
+def _peak(function):
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=float, default=0.2,
+                        help='size of the synthetic tree, 1.0 holds 512 MiB of huge files')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('--output', help='also write the results to this JSON file')
+    args = parser.parse_args(argv)
+
+    root = tempfile.mkdtemp()
+    try:
+        results = run(root, args.scale, args.repeat)
+    finally:
+        shutil.rmtree(root)
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    regressions = compare(results, baseline, args.tolerance)
+    for name, (value, unit, _) in results.items():
+        line = '{:<20} {:>12.2f} {:<12}'.format(name, value, unit)
+        if name in baseline:
+            line += ' baseline {:>12.2f} ({:+.0%})'.format(
+                baseline[name][0], value / baseline[name][0] - 1 if baseline[name][0] else 0)
+        if name in regressions:
+            line += '  REGRESSION'
+        print(line)
+
+    for path in (args.output, args.baseline if args.save_baseline else None):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(results, f, indent=2)
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""Measures how long `import pyfileinfo` takes in a fresh interpreter.
+
+    python benchmarks/startup.py --repeat 10 --max-ms 60
+
+Exits with status 1 if the median import time exceeds --max-ms.
+"""
+
+from __future__ import absolute_import, print_function
+
+import os
+import sys
+import argparse
+import subprocess
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_MEASURE = ('import time; start = time.time(); import pyfileinfo; '
+            'print((time.time() - start) * 1000)')
+
+
+def measure(statement=_MEASURE):
+    # Milliseconds reported by a new interpreter importing the package from this tree.
+    env = dict(os.environ, PYTHONPATH=ROOT, PYTHONDONTWRITEBYTECODE='')
+    output = subprocess.check_output([sys.executable, '-c', statement], env=env)
+    return float(output.decode().strip())
+
+
+def loaded_modules():
+    # Top-level names of the modules `import pyfileinfo` leaves in sys.modules.
+    statement = ('import sys; before = set(sys.modules); import pyfileinfo; '
+                 'print(" ".join(sorted(set(m.split(".")[0] for m in sys.modules) - '
+                 'set(m.split(".")[0] for m in before))))')
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    return subprocess.check_output([sys.executable, '-c', statement], env=env).decode().split()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--max-ms', type=float, default=None,
+                        help='fail if the median import time exceeds this')
+    args = parser.parse_args(argv)
+
+    measure()  # Warms up the bytecode cache.
+    timings = sorted(measure() for _ in range(args.repeat))
+    median = timings[len(timings) // 2]
+
+    print('import pyfileinfo: median {:.1f} ms, min {:.1f} ms, max {:.1f} ms'.format(
+        median, timings[0], timings[-1]))
+    print('modules loaded: {}'.format(' '.join(loaded_modules())))
+
+    if args.max_ms is not None and median > args.max_ms:
+        print('import time exceeds {:.1f} ms'.format(args.max_ms), file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""Generates synthetic trees for the benchmarks.
+
+    python benchmarks/tree.py /tmp/tree --scale 0.1
+"""
+
+from __future__ import absolute_import, print_function
+
+import os
+import sys
+import json
+import zlib
+import struct
+import argparse
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_ROOT = os.path.join(ROOT, 'tests', 'data')
+
+CHUNK = os.urandom(1024 * 1024)
+
+
+def png(width=16, height=16):
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + \
+            struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+
+    rows = b''.join(b'\x00' + b'\x80\x40\x20' * width for _ in range(height))
+    return b'\x89PNG\r\n\x1a\n' + \
+        chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)) + \
+        chunk(b'IDAT', zlib.compress(rows)) + chunk(b'IEND', b'')
+
+
+def _read(name):
+    with open(os.path.join(DATA_ROOT, name), 'rb') as f:
+        return f.read()
+
+
+# Contents of the mixed files by extension, the type they are detected as first.
+SAMPLES = {
+    '.json': ('JSON', json.dumps({'items': list(range(100)), 'name': 'sample'}).encode()),
+    '.yml': ('YAML', b'name: sample\nitems:\n' + b''.join(b'  - %d\n' % idx for idx in range(100))),
+    '.png': ('Image', png()),
+    '.jpg': ('Image', _read('5x5.jpg')),
+    '.mp4': ('Medium', _read('empty.mp4')),
+    '.txt': ('YAML', b'plain text\n' * 10),
+    '.bin': ('File', b'\x00\xff' * 512),
+}
+
+
+def make_tree(root, scale=1.0):
+    # Lays out, under root:
+    #   wide/  one directory of many mixed files
+    #   deep/  a chain of nested directories with a few files each
+    #   small/ many directories of tiny files
+    #   huge/  a few large files
+    # and returns {layout: path}.
+    layouts = {name: os.path.join(root, name) for name in ('wide', 'deep', 'small', 'huge')}
+    for path in layouts.values():
+        os.makedirs(path)
+
+    extensions = sorted(SAMPLES)
+    for idx in range(max(len(extensions), int(2000 * scale))):
+        extension = extensions[idx % len(extensions)]
+        _write(os.path.join(layouts['wide'], 'file {}{}'.format(idx, extension)),
+               SAMPLES[extension][1])
+
+    directory = layouts['deep']
+    for depth in range(max(2, int(50 * scale))):
+        directory = os.path.join(directory, 'level {}'.format(depth))
+        os.mkdir(directory)
+        for idx in range(5):
+            _write(os.path.join(directory, 'file {}.bin'.format(idx)), b'\x00' * 64)
+
+    for directory_idx in range(max(2, int(100 * scale))):
+        directory = os.path.join(layouts['small'], 'dir {}'.format(directory_idx))
+        os.mkdir(directory)
+        for idx in range(100):
+            _write(os.path.join(directory, 'file {}'.format(idx)), b'x' * (idx % 7))
+
+    for idx in range(2):
+        with open(os.path.join(layouts['huge'], 'huge {}.bin'.format(idx)), 'wb') as f:
+            for _ in range(max(1, int(256 * scale))):
+                f.write(CHUNK)
+
+    return layouts
+
+
+def _write(path, content):
+    with open(path, 'wb') as f:
+        f.write(content)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('root')
+    parser.add_argument('--scale', type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    for name, path in sorted(make_tree(args.root, args.scale).items()):
+        print('{:<6} {}'.format(name, path))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,13 +2,42 @@
 
 from __future__ import absolute_import
 
-from pyfileinfo.pyfileinfo import PyFileInfo
+import sys
+from importlib import import_module
+
+from pyfileinfo.pyfileinfo import PyFileInfo, natural_sort_key
 from pyfileinfo.file import File
-from pyfileinfo.directory import Directory
-from pyfileinfo.image import Image
-from pyfileinfo.json import JSON
-from pyfileinfo.medium import Medium
-from pyfileinfo.yaml import YAML
 
 
-__all__ = ['PyFileInfo', 'File', 'Directory', 'Image', 'JSON', 'Medium', 'YAML']
+__all__ = ['PyFileInfo', 'File', 'Directory', 'Image', 'JSON', 'Medium', 'YAML',
+           'natural_sort_key']
+
+# Backends, with the heavy dependencies they pull in, are imported on first access.
+_BACKENDS = {
+    'Directory': 'pyfileinfo.directory',
+    'Image': 'pyfileinfo.image',
+    'JSON': 'pyfileinfo.json',
+    'Medium': 'pyfileinfo.medium',
+    'YAML': 'pyfileinfo.yaml',
+}
+
+
+def __getattr__(name):
+    if name not in _BACKENDS:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+    value = getattr(import_module(_BACKENDS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_BACKENDS))
+
+
+if sys.version_info < (3, 7):  # No module __getattr__ before PEP 562.
+    from pyfileinfo.directory import Directory  # noqa: E402,F401
+    from pyfileinfo.image import Image  # noqa: E402,F401
+    from pyfileinfo.json import JSON  # noqa: E402,F401
+    from pyfileinfo.medium import Medium  # noqa: E402,F401
+    from pyfileinfo.yaml import YAML  # noqa: E402,F401
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import weakref
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+
+from pyfileinfo.walk import walk
+
+
+DEFAULT_WORKERS = 16
+DEFAULT_BATCH_SIZE = 256
+
+_settings = {'max_workers': DEFAULT_WORKERS, 'concurrency': None}
+_executor = None
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def configure(max_workers=None, concurrency=None):
+    # max_workers bounds the threads blocking calls run on, and concurrency the number of
+    # calls in flight per event loop (unbounded by default, beyond the threads).
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+
+    _settings['max_workers'] = max_workers or DEFAULT_WORKERS
+    _settings['concurrency'] = concurrency
+    _semaphores.clear()
+
+
+async def run(function, *args, **kwargs):
+    loop = asyncio.get_event_loop()
+    semaphore = _semaphore(loop)
+    if semaphore is None:
+        return await loop.run_in_executor(_get_executor(), partial(function, *args, **kwargs))
+
+    async with semaphore:
+        return await loop.run_in_executor(_get_executor(), partial(function, *args, **kwargs))
+
+
+async def probe(file):
+    return await run(getattr, file, 'instance')
+
+
+async def size(file):
+    return await run(getattr, file, 'size')
+
+
+async def stat(file):
+    return await run(file.stat)
+
+
+async def hashes(file, algorithms, buffer_size=None, use_mmap=False):
+    return await run(file.hashes, algorithms, buffer_size=buffer_size, use_mmap=use_mmap)
+
+
+async def md5(file):
+    return await run(getattr, file, 'md5')
+
+
+class AsyncFiles(object):
+    # Async iterator over walk(path, ...), which reads the tree on the executor in batches.
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE, **kwargs):
+        self._files = walk(path, **kwargs)
+        self._batch_size = batch_size
+        self._batch = []
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._batch:
+            self._batch = await run(self._next_batch)
+            self._batch.reverse()
+
+        if not self._batch:
+            raise StopAsyncIteration
+
+        return self._batch.pop()
+
+    def _next_batch(self):
+        batch = []
+        for file in self._files:
+            batch.append(file)
+            if len(batch) >= self._batch_size:
+                break
+
+        return batch
+
+
+def _get_executor():
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(_settings['max_workers'])
+
+    return _executor
+
+
+def _semaphore(loop):
+    if _settings['concurrency'] is None:
+        return None
+
+    if loop not in _semaphores:
+        _semaphores[loop] = asyncio.Semaphore(_settings['concurrency'])
+
+    return _semaphores[loop]
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+
+import os
+import json
+import sqlite3
+import threading
+from collections import namedtuple
+
+from pyfileinfo import instrument
+from pyfileinfo.file import stat_signature
+
+
+CacheEntry = namedtuple('CacheEntry', ['type', 'metadata', 'digests'])
+
+
+class MetadataCache(object):
+    """Persistent store of detected types, metadata and digests.
+
+    Entries are keyed by the stat signature (device, inode, size, mtime_ns) of a file,
+    so an entry silently stops matching as soon as the file is modified or replaced.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS entries ('
+                                     'device INTEGER NOT NULL, '
+                                     'inode INTEGER NOT NULL, '
+                                     'size INTEGER NOT NULL, '
+                                     'mtime_ns INTEGER NOT NULL, '
+                                     'type TEXT, '
+                                     'metadata TEXT, '
+                                     'digests TEXT, '
+                                     'PRIMARY KEY (device, inode))')
+
+    @property
+    def path(self):
+        return self._path
+
+    def load(self, path, signature=None):
+        signature = signature or _signature(path)
+        if signature is None:
+            return None
+
+        entry = self._load(signature)
+        if instrument.enabled:
+            instrument.emit('cache', 'miss' if entry is None else 'hit', path=path)
+
+        return entry
+
+    def store(self, path, type=None, metadata=None, digests=None, signature=None):
+        # Pass the signature taken before reading the file, so that an entry computed
+        # from a file modified in the meantime never matches.
+        signature = signature or _signature(path)
+        if signature is None:
+            return
+
+        with self._lock, self._connection:
+            entry = self._load(signature, lock=False)
+            if entry is not None:
+                type = type or entry.type
+                metadata = entry.metadata if metadata is None else metadata
+                digests = dict(entry.digests, **(digests or {}))
+
+            self._connection.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                     signature + (type,
+                                                  json.dumps(metadata or {}),
+                                                  json.dumps(digests or {})))
+
+    @staticmethod
+    def signature(path):
+        return _signature(path)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def _load(self, signature, lock=True):
+        device, inode, size, mtime_ns = signature
+        if lock:
+            with self._lock:
+                row = self._select(device, inode)
+        else:
+            row = self._select(device, inode)
+
+        if row is None or tuple(row[:2]) != (size, mtime_ns):
+            return None
+
+        return CacheEntry(row[2], json.loads(row[3]), json.loads(row[4]))
+
+    def _select(self, device, inode):
+        return self._connection.execute('SELECT size, mtime_ns, type, metadata, digests '
+                                        'FROM entries WHERE device = ? AND inode = ?',
+                                        (device, inode)).fetchone()
+
+
+def _signature(path):
+    start = instrument.start()
+    try:
+        stat = os.stat(path)
+    except (IOError, OSError):
+        return None
+    finally:
+        if start is not None:
+            instrument.emit('stat', 'MetadataCache.signature', start, path=path)
+
+    return stat_signature(stat)
@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+
+import os
+from array import array
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from six import string_types
+
+from pyfileinfo import registry
+from pyfileinfo.pyfileinfo import PyFileInfo
+from pyfileinfo.file import INT64, mtime_ns
+from pyfileinfo.walk import ENCODING, entries
+
+
+DIRECTORY = 'Directory'
+FILE = 'File'
+
+_NAN = float('nan')
+
+
+class Catalog(object):
+    """Entries of a directory tree kept column by column.
+
+    Paths are stored as one UTF-8 buffer relative to the root, and sizes, modification
+    times (in nanoseconds), type codes and, optionally, durations (in seconds, NaN when
+    unknown), widths and heights (-1 when unknown) in typed arrays, so no object is kept
+    per entry. With NumPy installed, column() returns NumPy views and filters and
+    aggregates are computed on them.
+    """
+
+    def __init__(self, root, names, offsets, sizes, mtimes, types, type_names,
+                 durations=None, widths=None, heights=None):
+        self._root = root
+        self._names = names
+        self._offsets = offsets
+        self._type_names = type_names
+        self._columns = {'sizes': sizes, 'mtimes': mtimes, 'types': types}
+        if durations is not None:
+            self._columns.update(durations=durations, widths=widths, heights=heights)
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    @property
+    def root(self):
+        return self._root
+
+    @property
+    def type_names(self):
+        return list(self._type_names)
+
+    @property
+    def has_media(self):
+        return 'durations' in self._columns
+
+    def column(self, name):
+        # One of 'sizes', 'mtimes', 'types', 'durations', 'widths' and 'heights', as a
+        # NumPy array sharing the column's memory if NumPy is available.
+        column = self._columns[name]
+        if numpy is None:
+            return column
+
+        if not column:  # frombuffer() refuses empty buffers.
+            return numpy.zeros(0, dtype=column.typecode)
+
+        return numpy.frombuffer(column, dtype=column.typecode)
+
+    def relpath(self, idx):
+        return self._names[self._offsets[idx]:self._offsets[idx + 1]].decode(*ENCODING)
+
+    def path(self, idx):
+        return os.path.join(self._root, self.relpath(idx))
+
+    def paths(self):
+        for idx in range(len(self)):
+            yield self.path(idx)
+
+    def type_name(self, idx):
+        return self._type_names[self._columns['types'][idx]]
+
+    def rows(self):
+        # Yields (path, size, mtime_ns, type) tuples, followed by duration, width and height
+        # when the catalog has them, e.g. to write the catalog out.
+        sizes, mtimes = self._columns['sizes'], self._columns['mtimes']
+        media = [self._columns[name] for name in _MEDIA_COLUMNS if name in self._columns]
+        for idx in range(len(self)):
+            yield (self.path(idx), sizes[idx], mtimes[idx], self.type_name(idx)) + \
+                tuple(column[idx] for column in media)
+
+    def filter(self, type=None, min_size=None, max_size=None, modified_after=None,
+               modified_before=None):
+        # Returns a Catalog of the entries matching every given condition. type is a type
+        # name or a list of them, modified_after and modified_before are in seconds.
+        codes = self._codes(type)
+        after = None if modified_after is None else int(modified_after * 10 ** 9)
+        before = None if modified_before is None else int(modified_before * 10 ** 9)
+
+        if numpy is not None:
+            mask = numpy.ones(len(self), dtype=bool)
+            if codes is not None:
+                mask &= numpy.isin(self.column('types'), list(codes))
+            if min_size is not None:
+                mask &= self.column('sizes') >= min_size
+            if max_size is not None:
+                mask &= self.column('sizes') <= max_size
+            if after is not None:
+                mask &= self.column('mtimes') > after
+            if before is not None:
+                mask &= self.column('mtimes') < before
+
+            return self.take(numpy.flatnonzero(mask))
+
+        sizes, mtimes, types = (self._columns[name] for name in ('sizes', 'mtimes', 'types'))
+        indices = [idx for idx in range(len(self))
+                   if (codes is None or types[idx] in codes) and
+                   (min_size is None or sizes[idx] >= min_size) and
+                   (max_size is None or sizes[idx] <= max_size) and
+                   (after is None or mtimes[idx] > after) and
+                   (before is None or mtimes[idx] < before)]
+        return self.take(indices)
+
+    def take(self, indices):
+        # Returns a Catalog of the entries at indices, in that order.
+        names, offsets = bytearray(), array(INT64, [0])
+        for idx in indices:
+            names += self._names[self._offsets[idx]:self._offsets[idx + 1]]
+            offsets.append(len(names))
+
+        columns = {}
+        for name, column in self._columns.items():
+            if numpy is not None:
+                selected = self.column(name)[numpy.asarray(indices, dtype='int64')].tobytes()
+            else:
+                selected = [column[idx] for idx in indices]
+
+            columns[name] = array(column.typecode, selected)
+
+        return Catalog(self._root, names, offsets, type_names=self._type_names, **columns)
+
+    def total_size(self):
+        # Sum of the sizes of everything but directories.
+        return sum(self.size_by_type().values())
+
+    def total_duration(self):
+        return sum(self.duration_by_type().values())
+
+    def count_by_type(self):
+        return self._by_type(None)
+
+    def size_by_type(self):
+        totals = self._by_type('sizes')
+        totals.pop(DIRECTORY, None)
+        return totals
+
+    def duration_by_type(self):
+        # Sum of the known durations, in seconds, of the types having any.
+        if not self.has_media:
+            raise ValueError('catalog was built without media=True')
+
+        return {name: total for name, total in self._by_type('durations').items() if total}
+
+    @classmethod
+    def build(cls, path, include_hidden_file=False, recursive=True, sort=True, detect='full',
+              media=False, cache=None, profile=None):
+        # Walks path and fills the columns. detect is 'full' to detect types like PyFileInfo
+        # does, through cache if given, 'extension' to only go by the backends' hints, or
+        # None to tell directories from files only. media=True also reads durations,
+        # widths and heights, which requires detect='full'. profile is PyFileInfo's.
+        if detect not in ('full', 'extension', None):
+            raise ValueError('unknown detect mode: {!r}'.format(detect))
+
+        if media and detect != 'full':
+            raise ValueError("media=True requires detect='full'")
+
+        root = os.path.abspath(path)
+        prefix = len(os.path.join(root, ''))  # Entry paths are made by joining root.
+        names, offsets = bytearray(), array(INT64, [0])
+        sizes, mtimes, types = array(INT64), array(INT64), array('B')
+        durations, widths, heights = array('d'), array(INT64), array(INT64)
+        type_names, codes, hinted = [], {}, {}
+
+        def code(name):
+            if name not in codes:
+                codes[name] = len(type_names)
+                type_names.append(name)
+
+            return codes[name]
+
+        for entry, is_directory in entries(root, include_hidden_file, recursive, sort):
+            try:
+                stat = entry.stat()
+            except OSError:  # e.g. a dangling symbolic link.
+                continue
+
+            instance = None
+            if is_directory:
+                type_name = DIRECTORY
+            elif detect == 'full':
+                instance = PyFileInfo(entry.path, cache=cache, profile=profile).instance
+                type_name = type(instance).__name__
+            elif detect == 'extension':
+                extension = os.path.splitext(entry.name)[1]
+                if extension not in hinted:
+                    hinted[extension] = _hinted_type(extension)
+
+                type_name = hinted[extension]
+            else:
+                type_name = FILE
+
+            names += entry.path[prefix:].encode(*ENCODING)
+            offsets.append(len(names))
+            sizes.append(0 if is_directory else stat.st_size)
+            mtimes.append(mtime_ns(stat))
+            types.append(code(type_name))
+            if media:
+                duration, width, height = _media(instance)
+                durations.append(_NAN if duration is None else duration)
+                widths.append(-1 if width is None else width)
+                heights.append(-1 if height is None else height)
+
+        if not media:
+            durations = widths = heights = None
+
+        return cls(root, names, offsets, sizes, mtimes, types, type_names,
+                   durations=durations, widths=widths, heights=heights)
+
+    def _codes(self, type):
+        if type is None:
+            return None
+
+        names = [type] if isinstance(type, string_types) else type
+        return frozenset(self._type_names.index(name) for name in names
+                         if name in self._type_names)
+
+    def _by_type(self, name):
+        # {type name: count of entries, or total of the name column} for the types present.
+        # Unknown values, NaN or -1, count as 0.
+        count = len(self._type_names)
+        if numpy is not None:
+            types = self.column('types')
+            counts = numpy.bincount(types, minlength=count).tolist()
+            if name is None:
+                totals = counts
+            else:
+                weights = numpy.nan_to_num(self.column(name).astype('float64'))
+                weights[weights < 0] = 0
+                totals = numpy.bincount(types, weights=weights, minlength=count).tolist()
+                if name != 'durations':
+                    totals = [int(total) for total in totals]
+        else:
+            counts, totals = [0] * count, [0] * count
+            column = self._columns[name] if name is not None else None
+            for idx, code in enumerate(self._columns['types']):
+                counts[code] += 1
+                value = 1 if column is None else column[idx]
+                if value > 0:  # False for NaN as well.
+                    totals[code] += value
+
+        return {type_name: total for type_name, total, entries
+                in zip(self._type_names, totals, counts) if entries}
+
+
+_MEDIA_COLUMNS = ['durations', 'widths', 'heights']
+
+
+def _hinted_type(extension):
+    for class_ in registry.detection_order(extension):
+        return class_.__name__ if registry.is_hinted(class_, extension) else FILE
+
+    return FILE
+
+
+def _media(instance):
+    # (duration, width, height) of a detected Medium or Image, None where unknown.
+    from pyfileinfo.image import Image
+    from pyfileinfo.medium import Medium
+
+    duration = width = height = None
+    try:
+        if isinstance(instance, Medium):
+            duration = instance.duration
+            if instance.is_video():
+                width, height = instance.width, instance.height
+        elif isinstance(instance, Image):
+            width, height = instance.resolution
+    except Exception:  # noqa: E722
+        pass  # Tracks without the information.
+
+    return duration, width, height
@@ -3,10 +3,13 @@
 from __future__ import absolute_import
 import os
 
-from pyfileinfo import PyFileInfo, File
+from pyfileinfo import File, registry
+from pyfileinfo.walk import walk
 
 
 class Directory(File):
+    __slots__ = ()
+
     def __init__(self, file_path):
         File.__init__(self, file_path)
 
@@ -14,21 +17,61 @@ class Directory(File):
     def is_valid(path):
         return os.path.isdir(path)
 
-    def files_in(self, include_hidden_file=False, recursive=False):
-        files = [PyFileInfo(os.path.join(self.path, filename))
-                 for filename in os.listdir(self.path)]
-        files.sort()
+    @staticmethod
+    def sniff(header):
+        return header is None
+
+    def files_in(self, include_hidden_file=False, recursive=False, sort=True):
+        return walk(self.path, include_hidden_file=include_hidden_file,
+                    recursive=recursive, sort=sort)
+
+    def afiles_in(self, include_hidden_file=False, recursive=False, sort=True):
+        from pyfileinfo.aio import AsyncFiles
+
+        return AsyncFiles(self.path, include_hidden_file=include_hidden_file,
+                          recursive=recursive, sort=sort)
+
+    def find_duplicates(self, include_hidden_file=False, recursive=True, workers=None,
+                        sample_size=None):
+        from pyfileinfo.duplicates import find_duplicates
+
+        files = self.files_in(include_hidden_file=include_hidden_file, recursive=recursive)
+        return find_duplicates(files, workers=workers, sample_size=sample_size)
+
+    def catalog(self, include_hidden_file=False, recursive=True, sort=True, detect='full',
+                media=False, cache=None, profile=None):
+        from pyfileinfo.catalog import Catalog
+
+        return Catalog.build(self.path, include_hidden_file=include_hidden_file,
+                             recursive=recursive, sort=sort, detect=detect, media=media,
+                             cache=cache, profile=profile)
 
-        for file in files:
-            if file.is_hidden() and not include_hidden_file:
-                continue
+    def snapshot(self, include_hidden_file=False, previous=None, cache=None):
+        from pyfileinfo.snapshot import Snapshot
 
-            yield file
-            if recursive and file.is_directory():
-                for sub_file in file.files_in(include_hidden_file=include_hidden_file,
-                                              recursive=recursive):
-                    yield sub_file
+        return Snapshot.build(self.path, include_hidden_file=include_hidden_file,
+                              previous=previous, cache=cache)
+
+    def watch(self, include_hidden_file=False, settle_time=None, cache=None):
+        from pyfileinfo.watcher import Watcher, DEFAULT_SETTLE_TIME
+
+        return Watcher(self.path, include_hidden_file=include_hidden_file,
+                       settle_time=DEFAULT_SETTLE_TIME if settle_time is None else settle_time,
+                       cache=cache)
+
+    def disk_usage(self, apparent=True, workers=None):
+        from pyfileinfo.usage import disk_usage
+
+        return disk_usage(self.path, apparent=apparent, workers=workers)
+
+    def subtotals(self, apparent=True, workers=None):
+        from pyfileinfo.usage import subtotals
+
+        return subtotals(self.path, apparent=apparent, workers=workers)
 
     @property
     def size(self):
-        return sum([file.size for file in self.files_in(include_hidden_file=True)])
+        return self.disk_usage()
+
+
+registry.register(Directory, priority=50)
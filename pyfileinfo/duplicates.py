@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+
+import hashlib
+import stat as stat_module
+from io import open
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from pyfileinfo import instrument
+
+
+DEFAULT_WORKERS = 8
+DEFAULT_SAMPLE_SIZE = 64 * 1024
+
+
+def find_duplicates(files, workers=None, sample_size=None, hash_algorithm=hashlib.md5,
+                    min_size=1):
+    # Yields lists of PyFileInfo with identical contents, as soon as each list is confirmed.
+    # Files are grouped by size, then by a digest of their head and tail, and only the
+    # files still colliding are fully hashed. Hard links to one inode count as one file.
+    sample_size = sample_size or DEFAULT_SAMPLE_SIZE
+    by_size = defaultdict(list)
+    seen = set()
+    for file in files:
+        try:
+            file_stat = file.stat()
+        except OSError:
+            continue
+
+        if not stat_module.S_ISREG(file_stat.st_mode) or file_stat.st_size < min_size:
+            continue
+
+        key = (file_stat.st_dev, file_stat.st_ino)
+        if key in seen:
+            continue
+
+        seen.add(key)
+        by_size[file_stat.st_size].append(file)
+
+    with ThreadPoolExecutor(workers or DEFAULT_WORKERS) as executor:
+        futures = {}
+
+        def submit(group, size, full):
+            batch = _Batch(size, len(group), full)
+            for file in group:
+                if full:
+                    future = executor.submit(_full_hash, file, hash_algorithm)
+                else:
+                    future = executor.submit(_sample_hash, file, size, sample_size, hash_algorithm)
+
+                futures[future] = (batch, file)
+
+        for size, group in by_size.items():
+            if len(group) > 1:
+                submit(group, size, full=False)
+
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch, file = futures.pop(future)
+                digest = future.result()
+                if digest is not None:
+                    batch.files[digest].append(file)
+
+                batch.remaining -= 1
+                if batch.remaining > 0:
+                    continue
+
+                for group in batch.files.values():
+                    if len(group) < 2:
+                        continue
+
+                    # A sample of a small file already covers all of its contents.
+                    if batch.full or batch.size <= 2 * sample_size:
+                        yield sorted(group)
+                    else:
+                        submit(group, batch.size, full=True)
+
+
+class _Batch(object):
+    __slots__ = ('size', 'remaining', 'full', 'files')
+
+    def __init__(self, size, remaining, full):
+        self.size = size
+        self.remaining = remaining
+        self.full = full
+        self.files = defaultdict(list)
+
+
+def _sample_hash(file, size, sample_size, hash_algorithm):
+    start = instrument.start()
+    digest = hash_algorithm()
+    try:
+        with open(file.path, mode='rb') as f:
+            if size <= 2 * sample_size:
+                digest.update(f.read())
+            else:
+                digest.update(f.read(sample_size))
+                f.seek(-sample_size, 2)
+                digest.update(f.read(sample_size))
+    except (IOError, OSError):
+        return None
+
+    if start is not None:
+        instrument.emit('hash', 'sample', start, bytes=min(size, 2 * sample_size),
+                        path=file.path)
+
+    return digest.hexdigest()
+
+
+def _full_hash(file, hash_algorithm):
+    try:
+        return file._calculate_hash(hash_algorithm)
+    except (IOError, OSError):
+        return None
@@ -1,27 +1,92 @@
 # -*- coding: utf-8 -*-
 
 import os
+from array import array
+try:
+    from sys import intern
+except ImportError:  # Python 2 only interns byte strings.
+    def intern(string):
+        return string
+
+try:
+    array('q')
+    INT64, UINT64 = 'q', 'Q'
+except ValueError:  # Python 2 has no long long typecodes, long is 64 bits on LP64 platforms.
+    INT64, UINT64 = 'l', 'L'
 
 
 class File(object):
+    __slots__ = ('_prefix', '_name')
+
     def __init__(self, path):
-        self._path = path
+        self._prefix, self._name = split_path(path)
 
     def __str__(self):
-        return self._path
+        return self.path
 
     @staticmethod
     def is_valid(path):
         return True
 
+    @classmethod
+    def probe(cls, path, profile=None):
+        # Returns an instance for path if it is valid, otherwise None. Subclasses which
+        # parse the file to validate it hand the parsed result over to the instance.
+        # profile is how deep to read the file, see pyfileinfo.medium.PROFILES; it is only
+        # passed when one was asked for.
+        if not cls.is_valid(path):
+            return None
+
+        return cls(path)
+
+    @classmethod
+    def from_metadata(cls, path, metadata):
+        return cls(path)
+
+    def metadata(self):
+        # JSON serializable summary kept by MetadataCache, see from_metadata().
+        return {}
+
+    @staticmethod
+    def covers(metadata, profile):
+        # Whether metadata, kept by MetadataCache, was read deep enough for profile.
+        return True
+
     @staticmethod
     def hint():
         return []
 
+    @staticmethod
+    def sniff(header):
+        # header is the first bytes of the file, or None if it couldn't be read.
+        # A match only nominates the class, is_valid() still confirms it.
+        return False
+
     @property
     def path(self):
-        return self._path
+        return self._prefix + self._name
 
     @property
     def size(self):
         return os.path.getsize(self.path)
+
+
+def split_path(path):
+    # Splits path after its last separator. The directory part is interned, so the entries
+    # of one directory share it instead of each holding their full path.
+    idx = max(path.rfind(os.sep), path.rfind(os.altsep) if os.altsep else -1) + 1
+    return intern(path[:idx]), path[idx:]
+
+
+def stat_signature(stat):
+    # (device, inode, size, mtime_ns), which tells whether a file is still the one some
+    # metadata was read from, e.g. by MetadataCache.
+    return stat.st_dev, stat.st_ino, stat.st_size, mtime_ns(stat)
+
+
+def mtime_ns(stat):
+    mtime = getattr(stat, 'st_mtime_ns', None)  # Python 3.3+
+    if mtime is None:
+        mtime = int(stat.st_mtime * 1000000000)
+
+    return mtime
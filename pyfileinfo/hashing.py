@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+
+import os
+import sys
+import mmap
+import hashlib
+from io import open
+
+from pyfileinfo import instrument
+
+
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+# Python 2's mmap has no buffer interface memoryview can take.
+_MMAP_VIEWS = sys.version_info[0] >= 3
+
+
+def calculate_hashes(path, algorithms, buffer_size=None, use_mmap=False):
+    # Computes every digest in algorithms (hashlib names or constructors) in a single
+    # pass over the file and returns {name: hexdigest}. Each chunk is large enough for
+    # hashlib to release the GIL while digesting it, so hashing many files on threads
+    # scales.
+    start = instrument.start()
+    buffer_size = buffer_size or DEFAULT_BUFFER_SIZE
+    digests = [_new(algorithm) for algorithm in algorithms]
+
+    with open(path, mode='rb', buffering=0) as f:
+        if use_mmap and _MMAP_VIEWS and os.fstat(f.fileno()).st_size > 0:
+            length = _update_from_mmap(f, digests, buffer_size)
+        else:
+            length = _update_from_reads(f, digests, buffer_size)
+
+    if start is not None:
+        instrument.emit('hash', '+'.join(digest.name for digest in digests), start,
+                        bytes=length, path=path)
+
+    return {digest.name: digest.hexdigest() for digest in digests}
+
+
+def algorithm_name(algorithm):
+    if callable(algorithm):
+        return algorithm().name
+
+    return hashlib.new(algorithm).name
+
+
+def _new(algorithm):
+    if callable(algorithm):
+        return algorithm()
+
+    return hashlib.new(algorithm)
+
+
+def _update_from_reads(f, digests, buffer_size):
+    buf = bytearray(buffer_size)
+    view = memoryview(buf)
+    total = 0
+    while True:
+        length = f.readinto(buf)
+        if not length:
+            return total
+
+        chunk = view[:length]
+        for digest in digests:
+            digest.update(chunk)
+
+        total += length
+
+
+def _update_from_mmap(f, digests, buffer_size):
+    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        for offset in range(0, len(mapped), buffer_size):
+            chunk = memoryview(mapped)[offset:offset + buffer_size]
+            try:
+                for digest in digests:
+                    digest.update(chunk)
+            finally:
+                chunk.release()
+
+        return len(mapped)
+    finally:
+        mapped.close()
@@ -1,47 +1,148 @@
 # -*- coding: utf-8 -*-
 
 from __future__ import absolute_import
-from PIL import Image as PILImage
 
+from pyfileinfo import instrument, registry
 from pyfileinfo.file import File
+from pyfileinfo.imageheader import ImageHeader, read_header
 
 
 class Image(File):
-    def __init__(self, file_path):
+    __slots__ = ('_header', '_image')
+
+    def __init__(self, file_path, header=None):
         File.__init__(self, file_path)
 
+        self._header = header
         self._image = None
 
     def __getattr__(self, item):
-        try:
-            return getattr(self.image, item)
-        except AttributeError:
-            if item == 'resolution':
-                return self.image.size
+        if item.startswith('_'):
+            raise AttributeError(item)
 
-            return File.__getattr__(self, item)
+        return getattr(self.image, item)
 
     @staticmethod
     def is_valid(path):
+        return Image.probe(path) is not None
+
+    @classmethod
+    def probe(cls, path, profile=None):
         try:
-            from PIL import Image as PILImage
-            PILImage.open(path)
+            header = _read_header(path)
         except Exception:  # noqa: E722
-            return False
+            return None
+
+        return cls(path, header)
 
-        return True
+    @classmethod
+    def from_metadata(cls, path, metadata):
+        return cls(path, ImageHeader(**metadata))
+
+    def metadata(self):
+        return dict(self.header._asdict())
+
+    @property
+    def header(self):
+        if self._header is None:
+            self._header = _read_header(self.path)
+
+        return self._header
 
     @property
     def image(self):
+        # Pixels are decoded here, and only here. The file is closed once they are loaded.
         if self._image is None:
-            self._image = PILImage.open(self.path)
+            from PIL import Image as PILImage
+
+            start = instrument.start()
+            loaded = None
+            try:
+                with PILImage.open(self.path) as image:
+                    image.load()
+                    loaded = image
+            finally:
+                if start is not None:
+                    instrument.emit('pil', 'load', start, ok=loaded is not None, path=self.path)
+
+            self._image = loaded
 
         return self._image
 
+    def thumbnail(self, size, cache_dir=None):
+        from pyfileinfo.thumbnail import thumbnail
+
+        return thumbnail(self.path, size, cache_dir=cache_dir)
+
+    @staticmethod
+    def thumbnails(paths, size, workers=None, cache_dir=None):
+        from pyfileinfo.thumbnail import thumbnails
+
+        return thumbnails(paths, size, workers=workers, cache_dir=cache_dir)
+
+    @property
+    def format(self):
+        return self.header.format
+
+    @property
+    def mode(self):
+        return self.header.mode
+
+    @property
+    def width(self):
+        return self.header.width
+
+    @property
+    def height(self):
+        return self.header.height
+
     @property
     def resolution(self):
-        return self._image.size
+        return self.width, self.height
 
     @staticmethod
     def hint():
         return ['.jpg', '.png', '.jpeg', '.bmp']
+
+    @staticmethod
+    def sniff(header):
+        if header is None:
+            return False
+
+        if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+            return True
+
+        return header.startswith(_SIGNATURES)
+
+
+registry.register(Image, priority=40)
+
+
+_SIGNATURES = (
+    b'\x89PNG\r\n\x1a\n',
+    b'\xff\xd8\xff',
+    b'BM',
+    b'GIF87a',
+    b'GIF89a',
+    b'II*\x00',
+    b'MM\x00*',
+)
+
+
+def _read_header(path):
+    start = instrument.start()
+    header = read_header(path)
+    if start is not None:
+        instrument.emit('open', 'image header', start, ok=header is not None, path=path)
+
+    if header is not None:
+        return header
+
+    # Formats the header parser doesn't know: Pillow reads their header without decoding.
+    from PIL import Image as PILImage
+
+    if instrument.enabled:
+        instrument.emit('pil', 'open', path=path)
+
+    with PILImage.open(path) as image:
+        return ImageHeader(image.format, image.mode, image.width, image.height)
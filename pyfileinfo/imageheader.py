@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+
+import struct
+from io import open
+from collections import namedtuple
+
+
+ImageHeader = namedtuple('ImageHeader', ['format', 'mode', 'width', 'height'])
+
+HEADER_SIZE = 4096
+
+_PNG_MODES = {
+    (1, 0): '1', (2, 0): 'L', (4, 0): 'L', (8, 0): 'L', (16, 0): 'I;16',
+    (8, 2): 'RGB', (16, 2): 'RGB',
+    (1, 3): 'P', (2, 3): 'P', (4, 3): 'P', (8, 3): 'P',
+    (8, 4): 'LA', (16, 4): 'RGBA',
+    (8, 6): 'RGBA', (16, 6): 'RGBA',
+}
+
+_JPEG_MODES = {1: 'L', 3: 'RGB', 4: 'CMYK'}
+
+# Start Of Frame markers, DHT (0xC4), JPG (0xC8) and DAC (0xCC) aside.
+_JPEG_SOF_MARKERS = frozenset([0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+                               0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF])
+
+# Markers without a length, TEM and RSTn.
+_JPEG_STANDALONE_MARKERS = frozenset([0x01] + list(range(0xD0, 0xD8)))
+
+
+def read_header(path):
+    # Returns the ImageHeader of a PNG, JPEG, BMP, GIF or WebP file read from its first
+    # bytes, with the mode Pillow would report, or None if it can't be told that way.
+    with open(path, mode='rb') as f:
+        header = f.read(HEADER_SIZE)
+
+        try:
+            if header.startswith(b'\x89PNG\r\n\x1a\n'):
+                return _png(header)
+
+            if header.startswith(b'\xff\xd8'):
+                return _jpeg(f)
+
+            if header.startswith(b'BM'):
+                return _bmp(header)
+
+            if header[:6] in (b'GIF87a', b'GIF89a'):
+                return _gif(header)
+
+            if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+                return _webp(header)
+        except (struct.error, IndexError):  # Truncated header.
+            return None
+
+    return None
+
+
+def _png(header):
+    if header[12:16] != b'IHDR':
+        return None
+
+    width, height, bit_depth, color_type = struct.unpack('>IIBB', header[16:26])
+    mode = _PNG_MODES.get((bit_depth, color_type))
+    if mode is None:
+        return None
+
+    return ImageHeader('PNG', mode, width, height)
+
+
+def _jpeg(f):
+    # Reads only the markers up to the frame header, seeking over their segments.
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        if byte == b'':
+            return None
+
+        if byte != b'\xff':
+            continue
+
+        marker = f.read(1)
+        while marker == b'\xff':  # Fill bytes.
+            marker = f.read(1)
+
+        if marker == b'' or marker == b'\xd9':
+            return None
+
+        marker = ord(marker)
+        if marker in _JPEG_STANDALONE_MARKERS or marker == 0x00:
+            continue
+
+        length, = struct.unpack('>H', f.read(2))
+        if marker in _JPEG_SOF_MARKERS:
+            _, height, width, components = struct.unpack('>BHHB', f.read(6))
+            mode = _JPEG_MODES.get(components)
+            if mode is None:
+                return None
+
+            return ImageHeader('JPEG', mode, width, height)
+
+        f.seek(length - 2, 1)
+
+
+def _bmp(header):
+    header_size, = struct.unpack('<I', header[14:18])
+    if header_size == 12:  # OS/2 BITMAPCOREHEADER
+        width, height, _, bits = struct.unpack('<HHHH', header[18:26])
+        compression = 0
+    elif header_size >= 40:
+        width, height, _, bits, compression = struct.unpack('<iiHHI', header[18:34])
+    else:
+        return None
+
+    # Palettes may turn out to be greyscale and bit fields to carry alpha, which Pillow
+    # reports as other modes, so only plain true colour bitmaps are handled here.
+    if bits not in (16, 24, 32) or compression != 0:
+        return None
+
+    return ImageHeader('BMP', 'RGB', width, abs(height))
+
+
+def _gif(header):
+    width, height, flags = struct.unpack('<HHB', header[6:11])
+    if not flags & 0x80:  # No global palette, frames may have their own.
+        return None
+
+    # Pillow ignores a greyscale ramp palette, and then the mode depends on the frames.
+    palette = bytearray(header[13:13 + 3 * (2 << (flags & 0x07))])
+    for idx in range(0, len(palette), 3):
+        if not idx // 3 == palette[idx] == palette[idx + 1] == palette[idx + 2]:
+            return ImageHeader('GIF', 'P', width, height)
+
+    return None
+
+
+def _webp(header):
+    chunk = header[12:16]
+    if chunk == b'VP8 ':
+        if header[23:26] != b'\x9d\x01\x2a':
+            return None
+
+        width, height = struct.unpack('<HH', header[26:30])
+        return ImageHeader('WEBP', 'RGB', width & 0x3FFF, height & 0x3FFF)
+
+    if chunk == b'VP8L':
+        if header[20:21] != b'\x2f':
+            return None
+
+        bits, = struct.unpack('<I', header[21:25])
+        mode = 'RGBA' if bits & (1 << 28) else 'RGB'
+        return ImageHeader('WEBP', mode, (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1)
+
+    if chunk == b'VP8X':
+        flags = bytearray(header[20:21])[0]
+        width = struct.unpack('<I', header[24:27] + b'\x00')[0] + 1
+        height = struct.unpack('<I', header[27:30] + b'\x00')[0] + 1
+        return ImageHeader('WEBP', 'RGBA' if flags & 0x10 else 'RGB', width, height)
+
+    return None
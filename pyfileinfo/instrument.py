@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+
+import threading
+from contextlib import contextmanager
+from collections import namedtuple
+try:
+    from time import perf_counter as clock
+except ImportError:
+    from time import time as clock
+
+
+# stage is what was done, e.g. 'detect', 'stat', 'hash', 'open', 'mediainfo', 'pil' or
+# 'cache', and name what it was done by or for, e.g. the File subclass probing the file.
+Event = namedtuple('Event', ['stage', 'name', 'seconds', 'bytes', 'ok', 'path'])
+
+# Instrumented code checks this before doing anything else, so that it costs an attribute
+# lookup while no observer is added.
+enabled = False
+
+_observers = []
+_lock = threading.Lock()
+
+
+def add_observer(observer):
+    # observer is called with every Event, from the thread which did the work. Work done
+    # in other processes, e.g. by probe_many(), isn't observed.
+    global enabled
+
+    with _lock:
+        _observers.append(observer)
+        enabled = True
+
+
+def remove_observer(observer):
+    global enabled
+
+    with _lock:
+        _observers.remove(observer)
+        enabled = bool(_observers)
+
+
+@contextmanager
+def observe(observer):
+    add_observer(observer)
+    try:
+        yield observer
+    finally:
+        remove_observer(observer)
+
+
+def record(keep_events=False):
+    # with instrument.record() as recorder: ... then recorder.summary() or .report().
+    return observe(Recorder(keep_events=keep_events))
+
+
+def emit(stage, name, start=None, bytes=0, ok=True, path=None):
+    # Reports an Event to the observers, lasting since start if it is a clock() value.
+    event = Event(stage, name, 0.0 if start is None else clock() - start, bytes, ok, path)
+    for observer in list(_observers):
+        observer(event)
+
+
+def start():
+    # clock() while instrumentation is enabled, otherwise None.
+    return clock() if enabled else None
+
+
+class Recorder(object):
+    """Observer counting Events, their failures, time and bytes per stage and name."""
+
+    def __init__(self, keep_events=False):
+        self._lock = threading.Lock()
+        self._totals = {}
+        self._events = [] if keep_events else None
+
+    def __call__(self, event):
+        with self._lock:
+            totals = self._totals.get((event.stage, event.name))
+            if totals is None:
+                totals = self._totals[(event.stage, event.name)] = [0, 0, 0.0, 0]
+
+            totals[0] += 1
+            totals[1] += 0 if event.ok else 1
+            totals[2] += event.seconds
+            totals[3] += event.bytes
+            if self._events is not None:
+                self._events.append(event)
+
+    @property
+    def events(self):
+        # The Events in the order they were recorded, if kept.
+        with self._lock:
+            return list(self._events) if self._events is not None else None
+
+    def summary(self):
+        # [{'stage', 'name', 'count', 'failures', 'seconds', 'bytes'}], by stage and name.
+        with self._lock:
+            return [{'stage': stage, 'name': name, 'count': count, 'failures': failures,
+                     'seconds': seconds, 'bytes': bytes}
+                    for (stage, name), (count, failures, seconds, bytes)
+                    in sorted(self._totals.items())]
+
+    def report(self):
+        lines = ['{:<10} {:<24} {:>8} {:>8} {:>10} {:>12}'.format(
+            'stage', 'name', 'count', 'failed', 'seconds', 'bytes')]
+        for row in self.summary():
+            lines.append('{stage:<10} {name:<24} {count:>8} {failures:>8} {seconds:>10.4f} '
+                         '{bytes:>12}'.format(**row))
+
+        return '\n'.join(lines)
+
+    def clear(self):
+        with self._lock:
+            self._totals.clear()
+            if self._events is not None:
+                del self._events[:]
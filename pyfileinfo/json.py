@@ -2,6 +2,8 @@
 
 from __future__ import absolute_import
 
+import os
+import codecs
 import json
 from io import open
 try:
@@ -9,15 +11,24 @@ try:
 except ImportError:
     from collections import Sequence
 
+from pyfileinfo import jsonstream
+from pyfileinfo import registry
 from pyfileinfo.file import File
+from pyfileinfo.jsonstream import JSONIndex, NotAContainerError
 
 
 class JSON(File, Sequence):
-    def __init__(self, file_path):
+    __slots__ = ('_instance', '_index')
+
+    # Documents at least this large are indexed instead of loaded, see JSONIndex.
+    STREAMING_THRESHOLD = 64 * 1024 * 1024
+
+    def __init__(self, file_path, instance=None, index=None):
         File.__init__(self, file_path)
         Sequence.__init__(self)
 
-        self._instance = None
+        self._instance = instance
+        self._index = index
 
     def __str__(self):
         return '%s\n%s' % (self.path,
@@ -25,30 +36,77 @@ class JSON(File, Sequence):
                                       ensure_ascii=False, sort_keys=True))
 
     def __getitem__(self, item):
+        if self._instance is None and self._index is not None:
+            return self._index[item]
+
         return self.instance[item]
 
     def __len__(self):
+        if self._instance is None and self._index is not None:
+            return len(self._index)
+
         return len(self.instance)
 
     def __getattr__(self, item):
+        if item.startswith('_'):
+            raise AttributeError(item)
+
         return getattr(self.instance, item)
 
     @staticmethod
     def hint():
         return ['.json']
 
+    @staticmethod
+    def sniff(header):
+        if header is None:
+            return False
+
+        if header.startswith(codecs.BOM_UTF8):
+            header = header[len(codecs.BOM_UTF8):]
+
+        return header.lstrip()[:1] in (b'{', b'[')
+
     @staticmethod
     def is_valid(path):
+        return JSON.probe(path) is not None
+
+    @classmethod
+    def probe(cls, path, profile=None):
         try:
-            json.load(open(path, encoding='utf8'))
+            if os.path.getsize(path) >= cls.STREAMING_THRESHOLD:
+                try:
+                    return cls(path, index=JSONIndex.build(path))
+                except NotAContainerError:
+                    pass  # Only arrays and objects are indexed.
+
+            return cls(path, _load(path))
         except Exception:  # noqa: E722
-            return False
+            return None
+
+    def iterate(self):
+        # Yields the values of a top-level array, or the (key, value) pairs of a top-level
+        # object, without loading the whole document if it is large.
+        if self._instance is not None:
+            return iter(self._instance.items() if isinstance(self._instance, dict)
+                        else self._instance)
+
+        if self._index is not None:
+            return self._index.iterate()
 
-        return True
+        return jsonstream.iterate(self.path)
 
     @property
     def instance(self):
         if self._instance is None:
-            self._instance = json.load(open(self.path))
+            self._instance = _load(self.path)
 
         return self._instance
+
+
+registry.register(JSON, priority=30)
+
+
+def _load(path):
+    with open(path, encoding='utf-8-sig') as f:
+        return json.load(f)
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+
+import os
+import re
+import json
+import codecs
+from io import open
+from array import array
+
+from pyfileinfo.file import INT64
+
+
+CHUNK_SIZE = 1024 * 1024
+
+_TOP_LEVEL = re.compile(br'[\[\]{}",:]')
+_NESTED = re.compile(br'[\[\]{}"]')
+_STRING = re.compile(br'["\\]')
+
+
+class NotAContainerError(ValueError):
+    pass
+
+
+class JSONIndex(object):
+    """Byte ranges of the top-level values of a JSON array or object.
+
+    Values are only decoded when they are accessed, so a document of any size can be
+    indexed, and validated, with memory bounded by its largest top-level value.
+    """
+
+    def __init__(self, path, kind, starts, ends, keys):
+        self._path = path
+        self._kind = kind
+        self._starts = starts
+        self._ends = ends
+        self._keys = keys
+        self._positions = None if keys is None else {key: idx for idx, key in enumerate(keys)}
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __getitem__(self, item):
+        if self._kind == 'object':
+            if item not in self._positions:
+                raise KeyError(item)
+
+            return self.value(self._positions[item])
+
+        if isinstance(item, slice):
+            return [self.value(idx) for idx in range(*item.indices(len(self)))]
+
+        if item < 0:
+            item += len(self)
+
+        if not 0 <= item < len(self):
+            raise IndexError('list index out of range')
+
+        return self.value(item)
+
+    def __contains__(self, item):
+        return self._positions is not None and item in self._positions
+
+    @property
+    def kind(self):
+        return self._kind
+
+    def keys(self):
+        return list(self._keys) if self._keys is not None else None
+
+    def value(self, idx):
+        with open(self._path, mode='rb') as f:
+            return _decode(f, self._starts[idx], self._ends[idx])
+
+    def iterate(self):
+        with open(self._path, mode='rb') as f:
+            for idx in range(len(self)):
+                value = _decode(f, self._starts[idx], self._ends[idx])
+                yield value if self._keys is None else (self._keys[idx], value)
+
+    @classmethod
+    def build(cls, path, validate=True):
+        # Raises ValueError if path isn't a JSON array or object, or, with validate=True,
+        # if any of its values isn't valid JSON.
+        starts, ends, keys = array(INT64), array(INT64), []
+        kind = None
+        for kind, key, start, end, value in _iterate(path, decode_values=validate):
+            if kind == 'object':
+                keys.append(key)
+
+            starts.append(start)
+            ends.append(end)
+
+        if kind is None:
+            kind = _kind(path)
+
+        return cls(path, kind, starts, ends, keys if kind == 'object' else None)
+
+
+def iterate(path):
+    # Yields the values of a top-level array, or (key, value) pairs of a top-level object,
+    # one at a time.
+    for kind, key, _, _, value in _iterate(path, decode_values=True):
+        yield value if kind == 'array' else (key, value)
+
+
+def _kind(path):
+    with open(path, mode='rb') as f:
+        return 'array' if _skip_preamble(f) == b'[' else 'object'
+
+
+def _iterate(path, decode_values):
+    with open(path, mode='rb') as f, open(path, mode='rb') as reader:
+        opening = _skip_preamble(f)
+        if opening not in (b'[', b'{'):
+            raise NotAContainerError('not a JSON array or object')
+
+        kind = 'array' if opening == b'[' else 'object'
+        closing = b']' if kind == 'array' else b'}'
+        start = f.tell()
+        key = None
+        for character, position in _structure(f, start):
+            if character == b':':
+                if kind != 'object' or key is not None:
+                    raise ValueError('unexpected ":" at {}'.format(position))
+
+                key = _decode(reader, start, position)
+                if not isinstance(key, type(u'')):
+                    raise ValueError('invalid key at {}'.format(start))
+
+                start = position + 1
+                continue
+
+            if character == closing:
+                if key is None and _is_blank(reader, start, position):
+                    if _follows_comma(reader, start):
+                        raise ValueError('missing value at {}'.format(position))
+
+                    break  # Empty array or object.
+            elif character != b',':
+                raise ValueError('unexpected "{}" at {}'.format(character.decode(), position))
+
+            if kind == 'object' and key is None:
+                raise ValueError('missing key at {}'.format(start))
+
+            value = _decode(reader, start, position) if decode_values else None
+            yield kind, key, start, position, value
+
+            if character == closing:
+                break
+
+            key = None
+            start = position + 1
+        else:
+            raise ValueError('unterminated JSON {}'.format(kind))
+
+        if not _is_blank(reader, position + 1, os.fstat(reader.fileno()).st_size):
+            raise ValueError('extra data after the JSON {}'.format(kind))
+
+
+def _structure(f, offset):
+    # Yields (character, position) for the ',', ':' and the closing bracket of the top-level
+    # container read from f, skipping over strings and nested containers.
+    depth = 1
+    in_string = False
+    skip = 0
+    while True:
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            break
+
+        idx, skip = skip, 0
+        while idx < len(chunk):
+            if in_string:
+                match = _STRING.search(chunk, idx)
+                if match is None:
+                    break
+
+                idx = match.end()
+                if match.group() == b'\\':
+                    if idx == len(chunk):
+                        skip = 1
+                    idx += 1
+                else:
+                    in_string = False
+                continue
+
+            match = (_TOP_LEVEL if depth == 1 else _NESTED).search(chunk, idx)
+            if match is None:
+                break
+
+            character, idx = match.group(), match.end()
+            if character == b'"':
+                in_string = True
+            elif character in (b'[', b'{'):
+                depth += 1
+            elif character in (b']', b'}'):
+                depth -= 1
+                if depth == 0:
+                    yield character, offset + match.start()
+                    return
+            else:
+                yield character, offset + match.start()
+
+        offset += len(chunk)
+
+    if in_string:
+        raise ValueError('unterminated string')
+
+
+def _skip_preamble(f):
+    head = f.read(len(codecs.BOM_UTF8))
+    if head != codecs.BOM_UTF8:
+        f.seek(0)
+
+    while True:
+        character = f.read(1)
+        if not character.isspace():
+            return character
+
+
+def _decode(f, start, end):
+    f.seek(start)
+    return json.loads(f.read(end - start).decode('utf8'))
+
+
+def _is_blank(f, start, end):
+    f.seek(start)
+    while start < end:
+        chunk = f.read(min(CHUNK_SIZE, end - start))
+        if chunk.strip():
+            return False
+
+        start += len(chunk)
+
+    return True
+
+
+def _follows_comma(f, start):
+    f.seek(start - 1)
+    return f.read(1) == b','
@@ -3,122 +3,163 @@
 from __future__ import absolute_import
 
 import os
-import pycountry
-from pymediainfo import MediaInfo
 from fractions import Fraction
 
+from pyfileinfo import instrument, registry
 from pyfileinfo.file import File
+from pyfileinfo.mediumrecord import MediumRecord
+
+
+# How deep mediainfo reads a file, as MediaInfo.parse() arguments. 'header' only reads the
+# headers, which is enough for durations, dimensions and tracks of most containers, and
+# doesn't look for the other parts of numbered sequences. 'full' reads the whole file,
+# e.g. for exact frame counts and bit rates of streams without an index.
+PROFILES = {
+    'header': {'parse_speed': 0, 'mediainfo_options': {'File_TestContinuousFileNames': '0'}},
+    'default': {'parse_speed': 0.5},
+    'full': {'parse_speed': 1},
+}
+
+DEFAULT_PROFILE = 'default'
+
+_DEPTHS = {'header': 0, 'default': 1, 'full': 2}
 
 
 class Medium(File):
-    def __init__(self, file_path):
+    __slots__ = ('_record', '_profile', '_video_tracks', '_audio_tracks', '_subtitle_tracks')
+
+    def __init__(self, file_path, record=None, profile=None):
         File.__init__(self, file_path)
 
+        profile = profile or DEFAULT_PROFILE
+        if profile not in PROFILES:
+            raise ValueError('unknown profile: {!r}'.format(profile))
+
+        self._record = record
+        self._profile = profile
         self._video_tracks = None
         self._audio_tracks = None
         self._subtitle_tracks = None
-        self._duration = None
-        self._mean_volume = None
-
-        self._mediainfo = None
 
     @staticmethod
     def is_valid(path):
+        return Medium.probe(path) is not None
+
+    @classmethod
+    def probe(cls, path, profile=None):
         if os.path.getsize(path) == 0:  # mediainfo can't handle empty file.
+            return None
+
+        medium = cls(path, profile=profile)
+        if len(medium.video_tracks) == 0 and len(medium.audio_tracks) == 0:
+            return None
+
+        return medium
+
+    @staticmethod
+    def probe_many(paths, workers=None, timeout=None, ordered=True, profile=None):
+        from pyfileinfo.probe import probe_many
+
+        return probe_many(paths, workers=workers, timeout=timeout, ordered=ordered,
+                          profile=profile)
+
+    @classmethod
+    def from_metadata(cls, path, metadata):
+        metadata = dict(metadata)
+        profile = metadata.pop('profile')
+        return cls(path, MediumRecord.from_data(metadata), profile=profile)
+
+    def metadata(self):
+        return dict(self.record.to_data(), profile=self._profile)
+
+    @staticmethod
+    def covers(metadata, profile):
+        if metadata.get('profile') not in _DEPTHS:
             return False
 
-        medium = Medium(path)
-        return len(medium.video_tracks) > 0 or len(medium.audio_tracks) > 0
+        return _DEPTHS[metadata['profile']] >= _DEPTHS[profile or DEFAULT_PROFILE]
+
+    @property
+    def profile(self):
+        return self._profile
 
     @property
     def mediainfo(self):
-        if self._mediainfo is None:
-            self._mediainfo = MediaInfo.parse(self.path)
+        # Parses the file again on every access, only the record read from it is kept.
+        from pymediainfo import MediaInfo
 
-        return self._mediainfo
+        start = instrument.start()
+        mediainfo = None
+        try:
+            mediainfo = MediaInfo.parse(self.path, **PROFILES[self._profile])
+        finally:
+            if start is not None:
+                instrument.emit('mediainfo', 'parse', start, ok=mediainfo is not None,
+                                path=self.path)
+
+        return mediainfo
+
+    @property
+    def record(self):
+        if self._record is None:
+            self._record = MediumRecord.from_tracks(self.mediainfo.tracks)
+
+        return self._record
 
     @property
     def title(self):
-        return self.mediainfo.tracks[0].title
+        return self.record.title
 
     @property
     def album(self):
-        return self.mediainfo.tracks[0].album
+        return self.record.album
 
     @property
     def album_performer(self):
-        return self.mediainfo.tracks[0].album_performer
+        return self.record.album_performer
 
     @property
     def performer(self):
-        return self.mediainfo.tracks[0].performer
+        return self.record.performer
 
     @property
     def track_name(self):
-        return self.mediainfo.tracks[0].track_name
+        return self.record.track_name
 
     @property
     def track_name_position(self):
-        return self.mediainfo.tracks[0].track_name_position
+        return self.record.track_name_position
 
     @property
     def part_position(self):
-        return self.mediainfo.tracks[0].part_position
+        return self.record.part_position
 
     @property
     def video_tracks(self):
         if self._video_tracks is None:
-            self._video_tracks = [_VideoTrack(track) for track in self.mediainfo.tracks
-                                  if track.track_type == 'Video']
+            self._video_tracks = [_VideoTrack(track) for track in self.record.video_tracks]
 
         return self._video_tracks
 
     @property
     def audio_tracks(self):
         if self._audio_tracks is None:
-            self._audio_tracks = [_AudioTrack(track) for track in self.mediainfo.tracks
-                                  if track.track_type == 'Audio']
+            self._audio_tracks = [_AudioTrack(track) for track in self.record.audio_tracks]
 
         return self._audio_tracks
 
     @property
     def subtitle_tracks(self):
         if self._subtitle_tracks is None:
-            self._subtitle_tracks = [_SubtitleTrack(track) for track in self.mediainfo.tracks
-                                     if track.track_type == 'Text']
+            self._subtitle_tracks = [_SubtitleTrack(track)
+                                     for track in self.record.subtitle_tracks]
 
         return self._subtitle_tracks
 
     @property
     def chapters(self):
-        tracks = [track for track in self.mediainfo.tracks if track.track_type == 'Menu']
-
-        if len(tracks) == 0:
-            return [{'Number': 1, 'Start': 0, 'Duration': self.duration}]
-
-        chapters = []
-        chapter_number = 1
-
-        for timing in dir(tracks[0]):
-            if len(timing.split('_')) != 3:
-                continue
-
-            hour, minutes, seconds = timing.split('_')
-            if not hour.isdigit():
-                continue
-
-            chapters.append({'Number': chapter_number,
-                             'Start': float(hour)*3600 + float(minutes)*60 + float(seconds)/1000,
-                             'Duration': None})
-
-            chapter_number += 1
-
-        chapters.append({'Start': self.duration})
-        for idx in range(len(chapters) - 1):
-            chapters[idx]['Duration'] = chapters[idx + 1]['Start'] - chapters[idx]['Start']
-
-        chapters.pop(-1)
-        return chapters
+        return [{'Number': chapter.number, 'Start': chapter.start, 'Duration': chapter.duration}
+                for chapter in self.record.chapters]
 
     @property
     def main_video_track(self):
@@ -145,12 +186,31 @@ class Medium(File):
 
     @property
     def duration(self):
-        return float(self.mediainfo.tracks[0].duration)/1000
+        return self.record.duration
 
     @staticmethod
     def hint():
         return ['.avi', '.mov', '.mp4', '.m4v', '.m4a', '.mkv', '.mpg', '.mpeg', '.ts', '.m2ts']
 
+    @staticmethod
+    def sniff(header):
+        if header is None:
+            return False
+
+        if header[4:8] in _ISO_BMFF_BOXES:
+            return True
+
+        if header[:4] in (b'RIFF', b'FORM') and header[8:12] in _RIFF_FORMS:
+            return True
+
+        if _is_transport_stream(header, 0, 188) or _is_transport_stream(header, 4, 192):  # TS, M2TS
+            return True
+
+        if header[:2] in _AUDIO_FRAME_SYNCS:  # MP3, AAC ADTS
+            return True
+
+        return header.startswith(_SIGNATURES)
+
     def is_audio_track_empty(self):
         return len(self.audio_tracks) == 0
 
@@ -164,12 +224,56 @@ class Medium(File):
         return not self.is_video() and len(self.audio_tracks) > 0
 
 
-class _Track:
-    def __init__(self, track):
-        self._track = track
+registry.register(Medium, priority=20)
+
+
+_ISO_BMFF_BOXES = (b'ftyp', b'moov', b'mdat', b'free', b'skip', b'wide', b'pnot')
+
+_RIFF_FORMS = (b'AVI ', b'WAVE', b'AIFF', b'AIFC')
+
+_AUDIO_FRAME_SYNCS = (b'\xff\xfb', b'\xff\xfa', b'\xff\xf3', b'\xff\xf2', b'\xff\xe3',
+                      b'\xff\xf1', b'\xff\xf9')
+
+_SIGNATURES = (
+    b'\x1a\x45\xdf\xa3',                  # Matroska, WebM
+    b'\x00\x00\x01\xba',                  # MPEG program stream
+    b'\x00\x00\x01\xb3',                  # MPEG video elementary stream
+    b'\x30\x26\xb2\x75\x8e\x66\xcf\x11',  # ASF, WMV, WMA
+    b'FLV\x01',
+    b'OggS',
+    b'fLaC',
+    b'ID3',
+)
+
+
+def _is_transport_stream(header, offset, packet_size):
+    positions = range(offset, min(len(header), offset + packet_size * 3), packet_size)
+    if len(positions) < 2:
+        return False
+
+    return all(header[position:position + 1] == b'\x47' for position in positions)
+
+
+class _Track(object):
+    # Attributes read as mediainfo reports them, e.g. duration in milliseconds, see
+    # TrackRecord.raw(), and None for those it doesn't report, as pymediainfo does.
+    __slots__ = ('_record',)
+
+    def __init__(self, record):
+        self._record = record
 
     def __getattr__(self, item):
-        return getattr(self._track, item)
+        if item.startswith('_'):
+            raise AttributeError(item)
+
+        if item.startswith('other_'):
+            raise AttributeError('{} is not kept, see MediumRecord'.format(item))
+
+        return self._record.raw(item)
+
+    @property
+    def record(self):
+        return self._record
 
     @property
     def stream_id(self):
@@ -177,24 +281,19 @@ class _Track:
 
     @property
     def streamorder(self):
-        return int(self._track.streamorder)
+        return self._record.streamorder
 
     @property
     def language(self):
-        if self._track.language is None:
-            return None
-
-        return pycountry.languages.get(alpha_2=self._track.language)
+        return _language(self._record.language)
 
 
 class _VideoTrack(_Track):
+    __slots__ = ()
+
     @property
     def display_aspect_ratio(self):
-        for aspect_ratio in self.other_display_aspect_ratio:
-            if ':' in aspect_ratio:
-                return aspect_ratio
-
-        return self.other_display_aspect_ratio[0]
+        return self._record.display_aspect_ratio
 
     @property
     def display_width(self):
@@ -214,20 +313,30 @@ class _VideoTrack(_Track):
     def progressive(self):
         return not self.interlaced
 
-    @property
-    def frame_rate(self):
-        return self._track.frame_rate
-
-    @property
-    def frame_count(self):
-        return self._track.frame_count
-
 
 class _AudioTrack(_Track):
+    __slots__ = ()
+
     @property
     def channels(self):
         return self.channel_s
 
 
 class _SubtitleTrack(_Track):
-    pass
+    __slots__ = ()
+
+
+_languages = {}
+
+
+def _language(code):
+    # pycountry scans its whole table on every lookup.
+    if code is None:
+        return None
+
+    if code not in _languages:
+        import pycountry
+
+        _languages[code] = pycountry.languages.get(alpha_2=code)
+
+    return _languages[code]
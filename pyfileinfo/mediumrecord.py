@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+
+import re
+from collections import namedtuple
+
+from pyfileinfo.file import intern
+
+
+Chapter = namedtuple('Chapter', ['number', 'start', 'duration'])
+
+_TRACK_FIELDS = ['kind', 'track_id', 'streamorder', 'stream_id', 'codec', 'title', 'language',
+                 'duration', 'width', 'height', 'display_aspect_ratio', 'scan_type',
+                 'frame_rate', 'frame_count', 'channels', 'extras']
+
+_MEDIUM_FIELDS = ['duration', 'title', 'album', 'album_performer', 'performer', 'track_name',
+                  'track_name_position', 'part_position', 'video_tracks', 'audio_tracks',
+                  'subtitle_tracks', 'chapters']
+
+# mediainfo attributes read into typed fields, by the name of the field.
+_TYPED = {'track_type': 'kind', 'track_id': 'track_id', 'streamorder': 'streamorder',
+          'stream_identifier': 'stream_id', 'codec': 'codec', 'title': 'title',
+          'language': 'language', 'duration': 'duration', 'width': 'width', 'height': 'height',
+          'display_aspect_ratio': 'display_aspect_ratio', 'scan_type': 'scan_type',
+          'frame_rate': 'frame_rate', 'frame_count': 'frame_count', 'channel_s': 'channels'}
+
+_CHAPTER_TIMING = re.compile(r'^(\d+)_(\d+)_(\d+)$')
+
+_TRACK_KINDS = {'Video': 'video_tracks', 'Audio': 'audio_tracks', 'Text': 'subtitle_tracks'}
+
+
+class TrackRecord(namedtuple('TrackRecord', _TRACK_FIELDS)):
+    # kind is 'Video', 'Audio' or 'Text', language an ISO 639-1 code, durations are in
+    # seconds and frame_rate in frames per second. channels is an int, or a string such
+    # as '7 / 6' when mediainfo reports several. extras holds the other scalar attributes
+    # of the track, and mediainfo's own value of the typed ones when it differs, e.g. the
+    # duration in milliseconds, as (names, values), names sorted and shared by the tracks
+    # with the same ones. The 'other_' variants aren't kept. raw() reads an attribute as
+    # mediainfo reported it.
+    __slots__ = ()
+
+    def get(self, name, default=None):
+        names, values = self.extras
+        try:
+            return values[names.index(name)]
+        except ValueError:
+            return default
+
+    def raw(self, name, default=None):
+        value = self.get(name, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        if name in _TYPED:
+            return getattr(self, _TYPED[name])
+
+        return default
+
+    def to_data(self):
+        data = dict(self._asdict())
+        data['extras'] = dict(zip(*self.extras))
+        return data
+
+    @classmethod
+    def from_data(cls, data):
+        return cls(**dict(data, extras=_extras(data['extras'])))
+
+    @classmethod
+    def from_track(cls, track):
+        # track is a pymediainfo Track, or anything with its to_data().
+        data = track.to_data()
+        record = cls(kind=data.get('track_type'),
+                     track_id=_int(data.get('track_id')),
+                     streamorder=_int(data.get('streamorder')),
+                     stream_id=_int(data.get('stream_identifier')),
+                     codec=_intern(data.get('codec')),
+                     title=data.get('title'),
+                     language=_intern(data.get('language')),
+                     duration=_seconds(data.get('duration')),
+                     width=_int(data.get('width')),
+                     height=_int(data.get('height')),
+                     display_aspect_ratio=_display_aspect_ratio(data),
+                     scan_type=_intern(data.get('scan_type')),
+                     frame_rate=_float(data.get('frame_rate')),
+                     frame_count=_int(data.get('frame_count')),
+                     channels=_channels(data.get('channel_s')),
+                     extras=((), ()))
+
+        extras = dict((key, value) for key, value in data.items()
+                      if key not in _TYPED and not key.startswith('other_') and
+                      _is_scalar(value))
+        for name, field in _TYPED.items():
+            value = data.get(name)
+            typed = getattr(record, field)
+            if type(value) is not type(typed) or value != typed:
+                extras[name] = value
+
+        return record._replace(extras=_extras(extras))
+
+
+class MediumRecord(namedtuple('MediumRecord', _MEDIUM_FIELDS)):
+    """What Medium reads from mediainfo, kept instead of the tracks it was parsed from.
+
+    It is immutable and picklable, and to_data() returns it as JSON serializable data,
+    read back by from_data(). duration is in seconds, and chapters are Chapters, or a
+    single one spanning the medium if it has none.
+    """
+    __slots__ = ()
+
+    def to_data(self):
+        data = dict(self._asdict())
+        for field in _TRACK_KINDS.values():
+            data[field] = [track.to_data() for track in data[field]]
+        data['chapters'] = [list(chapter) for chapter in self.chapters]
+        return data
+
+    @classmethod
+    def from_data(cls, data):
+        data = dict(data)
+        for field in _TRACK_KINDS.values():
+            data[field] = tuple(TrackRecord.from_data(track) for track in data[field])
+        data['chapters'] = tuple(Chapter(*chapter) for chapter in data['chapters'])
+        return cls(**data)
+
+    @classmethod
+    def from_tracks(cls, tracks):
+        # tracks are those of pymediainfo's MediaInfo, the first of them the General one.
+        general = tracks[0].to_data() if tracks else {}
+        duration = _seconds(general.get('duration'))
+        kinds = dict((field, []) for field in _TRACK_KINDS.values())
+        menu = None
+
+        for track in tracks:
+            if track.track_type in _TRACK_KINDS:
+                kinds[_TRACK_KINDS[track.track_type]].append(TrackRecord.from_track(track))
+            elif track.track_type == 'Menu' and menu is None:
+                menu = track
+
+        return cls(duration=duration,
+                   title=general.get('title'),
+                   album=general.get('album'),
+                   album_performer=general.get('album_performer'),
+                   performer=general.get('performer'),
+                   track_name=general.get('track_name'),
+                   track_name_position=general.get('track_name_position'),
+                   part_position=general.get('part_position'),
+                   chapters=_chapters(menu, duration),
+                   **dict((field, tuple(records)) for field, records in kinds.items()))
+
+
+def _chapters(menu, duration):
+    if menu is None:
+        return (Chapter(1, 0, duration),)
+
+    starts = []
+    for timing in sorted(menu.to_data()):
+        match = _CHAPTER_TIMING.match(timing)
+        if match is None:
+            continue
+
+        hour, minutes, milliseconds = match.groups()
+        starts.append(float(hour)*3600 + float(minutes)*60 + float(milliseconds)/1000)
+
+    ends = starts[1:] + [duration]
+    return tuple(Chapter(idx + 1, start, None if end is None else end - start)
+                 for idx, (start, end) in enumerate(zip(starts, ends)))
+
+
+_MISSING = object()
+
+_names = {}
+
+
+def _extras(attributes):
+    names = tuple(sorted(attributes))
+    names = _names.setdefault(names, tuple(intern(str(name)) for name in names))
+    return names, tuple(_intern(attributes[name]) for name in names)
+
+
+def _display_aspect_ratio(data):
+    aspect_ratios = data.get('other_display_aspect_ratio')
+    if not aspect_ratios:
+        return None
+
+    for aspect_ratio in aspect_ratios:
+        if ':' in aspect_ratio:
+            return intern(str(aspect_ratio))
+
+    return intern(str(aspect_ratios[0]))
+
+
+def _channels(value):
+    return _int(value) if _int(value) is not None else _intern(value)
+
+
+def _seconds(value):
+    milliseconds = _float(value)
+    return None if milliseconds is None else milliseconds / 1000
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_scalar(value):
+    return value is None or isinstance(value, (bool, int, float, str, type(u'')))
+
+
+def _intern(value):
+    # Codecs, languages and the like repeat from file to file.
+    return intern(value) if isinstance(value, str) else value
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+
+import time
+import traceback
+import multiprocessing
+from collections import namedtuple
+try:
+    from multiprocessing.connection import wait
+except ImportError:  # Python 2
+    def wait(connections, timeout=None):
+        # Connections ready to be received from, or at their end, polling until timeout.
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            ready = [connection for connection in connections if _poll(connection)]
+            if ready or deadline is not None and time.time() >= deadline:
+                return ready
+
+            time.sleep(0.01)
+
+    def _poll(connection):
+        try:
+            return connection.poll()
+        except (EOFError, IOError):
+            return True
+
+
+class ProbeResult(namedtuple('ProbeResult', ['path', 'metadata', 'error'])):
+    # metadata is Medium.metadata() of path, or None if path isn't a medium or couldn't be
+    # probed, in which case error tells why.
+    __slots__ = ()
+
+    def medium(self):
+        if self.metadata is None:
+            return None
+
+        from pyfileinfo.medium import Medium
+
+        return Medium.from_metadata(self.path, self.metadata)
+
+
+def probe_many(paths, workers=None, timeout=None, ordered=True, profile=None):
+    # Probes paths with MediaInfo on a pool of worker processes and yields a ProbeResult
+    # for each of them, in the order of paths or, with ordered=False, as they complete.
+    # A worker that crashes or takes longer than timeout seconds on a file is replaced,
+    # and only that file is reported as failed. profile is Medium's.
+    tasks = iter((index, path, profile) for index, path in enumerate(paths))
+    pool = [_Worker() for _ in range(workers or multiprocessing.cpu_count())]
+    pending = {}
+    next_index = 0
+
+    try:
+        for worker in pool:
+            worker.assign(next(tasks, None), timeout)
+
+        while any(worker.busy for worker in pool):
+            deadlines = [worker.deadline for worker in pool if worker.deadline is not None]
+            wait_timeout = max(0, min(deadlines) - time.time()) if deadlines else None
+            ready = wait([worker.connection for worker in pool if worker.busy], wait_timeout)
+
+            for worker in pool:
+                if not worker.busy:
+                    continue
+
+                if worker.connection in ready:
+                    result = worker.receive()
+                elif worker.deadline is not None and worker.deadline <= time.time():
+                    result = worker.abort('timed out after {} seconds'.format(timeout))
+                else:
+                    continue
+
+                if ordered:
+                    pending[result[0]] = result[1]
+                else:
+                    yield result[1]
+
+                worker.assign(next(tasks, None), timeout)
+
+            while next_index in pending:
+                yield pending.pop(next_index)
+                next_index += 1
+    finally:
+        for worker in pool:
+            worker.stop()
+
+
+class _Worker(object):
+    def __init__(self):
+        self.process = None
+        self.connection = None
+        self.task = None
+        self.deadline = None
+
+    @property
+    def busy(self):
+        return self.task is not None
+
+    def assign(self, task, timeout):
+        self.task = task
+        self.deadline = None
+        if task is None:
+            return
+
+        if self.process is None:
+            self.connection, child_connection = multiprocessing.Pipe()
+            self.process = multiprocessing.Process(target=_serve, args=(child_connection,))
+            self.process.daemon = True
+            self.process.start()
+            child_connection.close()
+
+        self.connection.send(task)
+        if timeout is not None:
+            self.deadline = time.time() + timeout
+
+    def receive(self):
+        index, path, _ = self.task
+        try:
+            received_index, metadata, error = self.connection.recv()
+        except (EOFError, OSError):
+            self.process.join()
+            return self.abort('worker exited with code {}'.format(self.process.exitcode))
+
+        assert received_index == index
+        self.task = None
+        return index, ProbeResult(path, metadata, error)
+
+    def abort(self, error):
+        index, path, _ = self.task
+        self.task = None
+        self.kill()
+        return index, ProbeResult(path, None, error)
+
+    def stop(self):
+        if self.process is None:
+            return
+
+        try:
+            self.connection.send(None)
+        except (IOError, OSError):
+            pass
+
+        self.process.join(1)
+        self.kill()
+
+    def kill(self):
+        if self.process is None:
+            return
+
+        if self.process.is_alive():
+            self.process.terminate()
+
+        self.process.join()
+        self.connection.close()
+        self.process = None
+        self.connection = None
+
+
+def _serve(connection):
+    while True:
+        task = connection.recv()
+        if task is None:
+            break
+
+        index, path, profile = task
+        try:
+            connection.send((index, _probe(path, profile), None))
+        except Exception:  # noqa: E722
+            connection.send((index, None, traceback.format_exc()))
+
+
+def _probe(path, profile):
+    from pyfileinfo.medium import Medium
+
+    medium = Medium.probe(path, profile=profile)
+    if medium is None:
+        return None
+
+    return medium.metadata()
@@ -4,12 +4,11 @@ from __future__ import unicode_literals
 
 import os
 import re
-import filecmp
 import hashlib
 import unicodedata
 from io import open
+from stat import S_ISREG
 from builtins import str
-from functools import partial
 try:
     from collections.abc import Sequence
 except ImportError:
@@ -17,52 +16,106 @@ except ImportError:
 
 from six import string_types
 
-from pyfileinfo.file import File
+from pyfileinfo import hashing, instrument, registry
+from pyfileinfo.file import File, split_path, stat_signature
+
+
+HEADER_SIZE = 4096
+
+_NUMBERS = re.compile('([0-9]+)')
 
 
 class PyFileInfo(Sequence):
-    def __init__(self, path):
+    __slots__ = ('_prefix', '_name', '_instance', '_cache', '_profile', '_entry', '_stat',
+                 '_digests', '_sort_key')
+
+    default_cache = None  # MetadataCache used by every PyFileInfo created without one.
+
+    def __init__(self, path, cache=None, profile=None):
+        # profile is how deep media files are read, see pyfileinfo.medium.PROFILES.
         Sequence.__init__(self)
 
-        self._path = unicodedata.normalize('NFC', str(path))
+        self._prefix, self._name = split_path(unicodedata.normalize('NFC', str(path)))
         self._instance = None
+        self._cache = cache
+        self._profile = profile
+        self._entry = None
+        self._stat = None
+        self._digests = None
+        self._sort_key = None
+
+    @classmethod
+    def from_entry(cls, entry, is_directory=None, cache=None):
+        # Builds from an os.scandir() DirEntry without detecting the type. Directories are
+        # recognized from the entry, and on Windows, where the entry comes with its stat
+        # result, that is reused by stat(). Elsewhere entry.stat() would only call os.stat(),
+        # so the entry isn't kept.
+        file = cls(entry.path, cache=cache)
+        if os.name == 'nt':
+            file._entry = entry
+        if is_directory is None:
+            is_directory = entry.is_dir()
+
+        if is_directory:
+            from pyfileinfo.directory import Directory
+
+            file._instance = Directory(file.path)
+
+        return file
 
     def __lt__(self, other):
-        def split_by_number(file_path):
-            def to_int_if_possible(c):
-                try:
-                    return int(c)
-                except:  # noqa: E722
-                    return c.lower()
-
-            return [to_int_if_possible(c) for c in re.split('([0-9]+)', file_path)]
-
-        return split_by_number(self.path) < split_by_number(other.path)
+        return self.sort_key < other.sort_key
 
     def __hash__(self):
-        return self._path.__hash__()
+        return hash((self._prefix, self._name))
 
     def __eq__(self, other):
+        # Compares contents. Use samepath() to compare paths only.
         if isinstance(other, string_types):
-            return filecmp.cmp(self.path, other, False)
+            other = PyFileInfo(other)
+
+        if not isinstance(other, PyFileInfo):
+            return False
+
+        stat, other_stat = self._restat(), other._restat()
+        if (stat.st_dev, stat.st_ino) == (other_stat.st_dev, other_stat.st_ino):
+            return True
+
+        if not S_ISREG(stat.st_mode) or not S_ISREG(other_stat.st_mode):
+            return False
+
+        if stat.st_size != other_stat.st_size:
+            return False
+
+        digests = self._known_digests(stat_signature(stat))
+        other_digests = other._known_digests(stat_signature(other_stat))
+        for name, digest in digests.items():
+            if name in other_digests:
+                return digest == other_digests[name]
+
+        return _compare_contents(self.path, other.path)
 
+    def samepath(self, other):
         if isinstance(other, PyFileInfo):
-            return filecmp.cmp(self.path, other.path, False)
+            other = other.path
 
-        return False
+        return _normalize_path(self.path) == _normalize_path(other)
 
     def __str__(self):
-        return self._path
+        return self.path
 
     def __getattr__(self, item):
-        for class_ in File.__subclasses__():
-            if item == 'is_{}'.format(class_.__name__.lower()):
-                if self._instance is None:
-                    return lambda: class_.is_valid(self.path)
+        if item.startswith('_'):  # e.g. a slot not set yet, or __setstate__ while unpickling.
+            raise AttributeError(item)
 
-                return lambda: isinstance(self.instance, class_)
+        class_ = registry.predicate(item)
+        if class_ is None:
+            return getattr(self.instance, item)
 
-        return getattr(self.instance, item)
+        if self._instance is None:
+            return lambda: class_.is_valid(self.path)
+
+        return lambda: isinstance(self.instance, class_)
 
     def __getitem__(self, item):
         return self.instance[item]
@@ -76,25 +129,48 @@ class PyFileInfo(Sequence):
     def is_exists(self):
         return os.path.exists(self.path)
 
+    def stat(self):
+        # Taken once, see _restat() for what has to be current.
+        if self._stat is None:
+            self._restat(entry=self._entry)
+
+        return self._stat
+
     @property
     def instance(self):
         if self._instance is None:
-            classes = sorted(File.__subclasses__(),
-                             key=lambda class_: self.extension in class_.hint(),
-                             reverse=True)
-            self._instance = File(self.path)
-            for class_ in classes:
-                if not class_.is_valid(self.path):
-                    continue
-
-                self._instance = class_(self.path)
-                break
+            cache = self.cache
+            entry = cache.load(self.path) if cache is not None else None
+            class_ = registry.find(entry.type, default=File) \
+                if entry is not None and entry.type is not None else None
+            if class_ is not None and class_.covers(entry.metadata, self._profile):
+                self._instance = class_.from_metadata(self.path, entry.metadata)
+            else:
+                signature = cache.signature(self.path) if cache is not None else None
+                self._instance = self._detect()
+                if signature is not None:
+                    cache.store(self.path, type=type(self._instance).__name__,
+                                metadata=self._instance.metadata(), signature=signature)
 
         return self._instance
 
+    @property
+    def cache(self):
+        if self._cache is None:
+            return PyFileInfo.default_cache
+
+        return self._cache
+
     @property
     def path(self):
-        return self._path
+        return self._prefix + self._name
+
+    @property
+    def sort_key(self):
+        if self._sort_key is None:
+            self._sort_key = _natural_sort_key(self.path)
+
+        return self._sort_key
 
     @property
     def extension(self):
@@ -112,13 +188,163 @@ class PyFileInfo(Sequence):
     def md5(self):
         return self._calculate_hash(hashlib.md5)
 
+    def hashes(self, algorithms, buffer_size=None, use_mmap=False):
+        # Returns {name: hexdigest} for every algorithm, reading the file at most once.
+        names = [hashing.algorithm_name(algorithm) for algorithm in algorithms]
+        cache = self.cache
+        signature = stat_signature(self._restat())
+
+        known = self._memoized_digests(signature)
+        digests = {name: known[name] for name in names if name in known}
+        if cache is not None and len(digests) < len(names):
+            entry = cache.load(self.path, signature=signature)
+            if entry is not None:
+                digests.update((name, entry.digests[name]) for name in names
+                               if name in entry.digests)
+
+        missing = [algorithm for algorithm, name in zip(algorithms, names) if name not in digests]
+        if missing:
+            computed = hashing.calculate_hashes(self.path, missing,
+                                                buffer_size=buffer_size, use_mmap=use_mmap)
+            digests.update(computed)
+            if cache is not None:
+                cache.store(self.path, digests=computed, signature=signature)
+
+        self._digests = (signature, dict(known, **digests))
+        return {name: digests[name] for name in names}
+
+    # Awaitable counterparts running on pyfileinfo.aio's bounded executor.
+    def aprobe(self):
+        from pyfileinfo import aio
+
+        return aio.probe(self)
+
+    def astat(self):
+        from pyfileinfo import aio
+
+        return aio.stat(self)
+
+    def asize(self):
+        from pyfileinfo import aio
+
+        return aio.size(self)
+
+    def amd5(self):
+        from pyfileinfo import aio
+
+        return aio.md5(self)
+
+    def ahashes(self, algorithms, buffer_size=None, use_mmap=False):
+        from pyfileinfo import aio
+
+        return aio.hashes(self, algorithms, buffer_size=buffer_size, use_mmap=use_mmap)
+
     def relpath(self, start):
         return os.path.relpath(self.path, start)
 
+    def _detect(self):
+        extension = self.extension
+        header = _read_header(self.path)
+        for class_ in registry.detection_order(extension):
+            # Unless the file can't be read, only the classes the header or the extension
+            # points at are asked to fully validate it.
+            if header is not None and not class_.sniff(header) \
+                    and not registry.is_hinted(class_, extension):
+                continue
+
+            start = instrument.start()
+            if self._profile is None:
+                instance = class_.probe(self.path)
+            else:
+                instance = class_.probe(self.path, profile=self._profile)
+            if start is not None:
+                instrument.emit('detect', class_.__name__, start, ok=instance is not None,
+                                path=self.path)
+
+            if instance is not None:
+                return instance
+
+        return File(self.path)
+
+    def _restat(self, entry=None):
+        # Stats the file again, unless entry, the DirEntry it was listed by, can tell.
+        start = instrument.start()
+        self._stat = entry.stat() if entry is not None else os.stat(self.path)
+        self._entry = None
+        if start is not None:
+            instrument.emit('stat', 'PyFileInfo.stat', start, path=self.path)
+
+        return self._stat
+
+    def _memoized_digests(self, signature):
+        # Digests computed by this object, as long as the file is the one they were of.
+        if self._digests is None or self._digests[0] != signature:
+            return {}
+
+        return self._digests[1]
+
+    def _known_digests(self, signature):
+        known = self._memoized_digests(signature)
+        cache = self.cache
+        if cache is None:
+            return known
+
+        entry = cache.load(self.path, signature=signature)
+        if entry is None:
+            return known
+
+        return dict(entry.digests, **known)
+
     def _calculate_hash(self, hash_algorithm):
-        with open(self.path, mode='rb') as f:
-            digest = hash_algorithm()
-            for buf in iter(partial(f.read, 128), b''):
-                digest.update(buf)
+        return self.hashes([hash_algorithm])[hashing.algorithm_name(hash_algorithm)]
+
+
+def natural_sort_key(path):
+    # Key sorting paths like PyFileInfo does, e.g. 'ep2.mp4' before 'ep10.mp4'.
+    return _natural_sort_key(unicodedata.normalize('NFC', str(path)))
+
+
+def _natural_sort_key(path):
+    parts = _NUMBERS.split(path)
+    parts[0::2] = [part.lower() for part in parts[0::2]]
+    parts[1::2] = [int(part) for part in parts[1::2]]
+    return tuple(parts)
+
+
+def _compare_contents(path, other_path):
+    start = instrument.start()
+    compared = 0
+    try:
+        with open(path, mode='rb') as f, open(other_path, mode='rb') as other_f:
+            while True:
+                buf = f.read(hashing.DEFAULT_BUFFER_SIZE)
+                if buf != other_f.read(hashing.DEFAULT_BUFFER_SIZE):
+                    return False
+
+                if not buf:
+                    return True
+
+                compared += len(buf)
+    finally:
+        if start is not None:
+            instrument.emit('open', 'compare', start, bytes=2 * compared, path=path)
+
+
+def _normalize_path(path):
+    return os.path.normcase(os.path.abspath(unicodedata.normalize('NFC', str(path))))
+
+
+def _read_header(path):
+    start = instrument.start()
+    header = None
+    try:
+        with open(path, mode='rb') as f:
+            header = f.read(HEADER_SIZE)
+    except (IOError, OSError):
+        pass
+
+    if start is not None:
+        instrument.emit('open', 'header', start, bytes=len(header or b''),
+                        ok=header is not None, path=path)
 
-        return digest.hexdigest()
+    return header
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+
+import warnings
+from itertools import count
+from threading import RLock
+from importlib import import_module
+
+
+ENTRY_POINT_GROUP = 'pyfileinfo.backends'
+
+# Modules registering the bundled backends, imported the first time a type is needed.
+BUILTIN_BACKENDS = ['pyfileinfo.directory', 'pyfileinfo.image', 'pyfileinfo.json',
+                    'pyfileinfo.medium', 'pyfileinfo.yaml']
+
+_lock = RLock()
+_loaded = False
+_backends = {}  # class -> (priority, registration number)
+_registrations = count()
+_by_name = {}
+_predicates = {}
+_ordered = ()
+_by_extension = {}
+_detection_orders = {}
+
+
+def register(class_, priority=0, extensions=None):
+    # Makes the File subclass class_ a candidate for detection. Backends with a higher
+    # priority are tried first, those whose extensions match the file's before any other.
+    # extensions defaults to class_.hint().
+    with _lock:
+        _backends[class_] = (priority, next(_registrations))
+        _by_name[class_.__name__] = class_
+        _predicates['is_{}'.format(class_.__name__.lower())] = class_
+        _reindex(class_, class_.hint() if extensions is None else extensions)
+
+
+def unregister(class_):
+    with _lock:
+        if _backends.pop(class_, None) is None:
+            return
+
+        for index in (_by_name, _predicates):
+            for key in [key for key, value in index.items() if value is class_]:
+                del index[key]
+
+        _reindex(class_, [])
+
+
+def backends():
+    # Every registered backend, highest priority first.
+    _load()
+    return _ordered
+
+
+def detection_order(extension):
+    # Backends in the order a file with extension is probed: those declaring the extension,
+    # then the others, by priority within each.
+    _load()
+    order = _detection_orders.get(extension)
+    if order is None:
+        hinted = _by_extension.get(extension, ())
+        order = hinted + tuple(class_ for class_ in _ordered if class_ not in hinted)
+        _detection_orders[extension] = order
+
+    return order
+
+
+def is_hinted(class_, extension):
+    _load()
+    return class_ in _by_extension.get(extension, ())
+
+
+def find(name, default=None):
+    # The backend whose class is named name, as stored by MetadataCache.
+    _load()
+    return _by_name.get(name, default)
+
+
+def predicate(name):
+    # The backend an 'is_<backend>' attribute refers to, or None.
+    _load()
+    return _predicates.get(name)
+
+
+def _reindex(class_, extensions):
+    global _ordered
+
+    _ordered = tuple(sorted(_backends, key=lambda item: (-_backends[item][0], _backends[item][1])))
+
+    rank = {item: idx for idx, item in enumerate(_ordered)}
+    for extension in list(_by_extension):
+        _by_extension[extension] = tuple(item for item in _by_extension[extension]
+                                         if item is not class_)
+    for extension in extensions:
+        _by_extension[extension] = _by_extension.get(extension, ()) + (class_,)
+    for extension, classes in list(_by_extension.items()):
+        if classes:
+            _by_extension[extension] = tuple(sorted(classes, key=rank.get))
+        else:
+            del _by_extension[extension]
+
+    _detection_orders.clear()
+
+
+def _load():
+    global _loaded
+
+    if _loaded:
+        return
+
+    with _lock:
+        if _loaded:
+            return
+
+        for name in BUILTIN_BACKENDS:
+            import_module(name)
+
+        for entry_point in _entry_points():
+            try:
+                register(entry_point.load())
+            except Exception as e:  # noqa: E722
+                warnings.warn("Couldn't load backend {}: {}".format(entry_point.name, e),
+                              RuntimeWarning)
+
+        _loaded = True
+
+
+def _entry_points():
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        try:
+            from pkg_resources import iter_entry_points
+        except ImportError:
+            return []
+
+        return list(iter_entry_points(ENTRY_POINT_GROUP))
+
+    entry_points = entry_points()
+    if hasattr(entry_points, 'select'):
+        return list(entry_points.select(group=ENTRY_POINT_GROUP))
+
+    return list(entry_points.get(ENTRY_POINT_GROUP, []))
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+
+import os
+import json
+from array import array
+from collections import namedtuple
+
+from pyfileinfo.pyfileinfo import PyFileInfo
+from pyfileinfo.file import INT64, UINT64, mtime_ns
+from pyfileinfo.catalog import DIRECTORY
+from pyfileinfo.walk import ENCODING, entries
+
+
+VERSION = 1
+
+SnapshotEntry = namedtuple('SnapshotEntry', ['path', 'device', 'inode', 'size', 'mtime_ns',
+                                             'type'])
+
+# Paths relative to the snapshots' root. renamed holds (old path, new path) pairs.
+SnapshotDiff = namedtuple('SnapshotDiff', ['added', 'removed', 'modified', 'renamed'])
+
+
+class Snapshot(object):
+    """Path, inode, size, modification time and detected type of every entry of a tree.
+
+    Columns are kept in arrays, with paths relative to the root in one UTF-8 buffer.
+    A snapshot is written and read as JSON by dump() and load().
+    """
+
+    def __init__(self, root, names, offsets, devices, inodes, sizes, mtimes, types, type_names):
+        self._root = root
+        self._names = names
+        self._offsets = offsets
+        self._devices = devices
+        self._inodes = inodes
+        self._sizes = sizes
+        self._mtimes = mtimes
+        self._types = types
+        self._type_names = type_names
+        self._positions = None
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __contains__(self, path):
+        return path in self._index()
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self.entry(idx)
+
+    @property
+    def root(self):
+        return self._root
+
+    def entry(self, idx):
+        return SnapshotEntry(self.relpath(idx), self._devices[idx], self._inodes[idx],
+                             self._sizes[idx], self._mtimes[idx],
+                             self._type_names[self._types[idx]])
+
+    def get(self, path, default=None):
+        # The SnapshotEntry of path, relative to the root.
+        idx = self._index().get(path)
+        return default if idx is None else self.entry(idx)
+
+    def relpath(self, idx):
+        return self._names[self._offsets[idx]:self._offsets[idx + 1]].decode(*ENCODING)
+
+    def dump(self, f):
+        # Writes the snapshot as JSON to the text file f.
+        json.dump({
+            'version': VERSION,
+            'root': self._root,
+            'type_names': self._type_names,
+            'paths': [self.relpath(idx) for idx in range(len(self))],
+            'devices': self._devices.tolist(),
+            'inodes': self._inodes.tolist(),
+            'sizes': self._sizes.tolist(),
+            'mtimes': self._mtimes.tolist(),
+            'types': self._types.tolist(),
+        }, f, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, f):
+        data = json.load(f)
+        if data.get('version') != VERSION:
+            raise ValueError('unsupported snapshot version: {!r}'.format(data.get('version')))
+
+        names, offsets = bytearray(), array(INT64, [0])
+        for path in data['paths']:
+            names += path.encode(*ENCODING)
+            offsets.append(len(names))
+
+        return cls(data['root'], names, offsets, array(UINT64, data['devices']),
+                   array(UINT64, data['inodes']), array(INT64, data['sizes']),
+                   array(INT64, data['mtimes']), array('H', data['types']), data['type_names'])
+
+    @classmethod
+    def build(cls, path, include_hidden_file=False, previous=None, cache=None):
+        # Walks path and stats every entry. Types are detected through PyFileInfo.instance,
+        # except for the entries previous has with the same inode, size and modification
+        # time, moved or not, which keep the type they had.
+        root = os.path.abspath(path)
+        prefix = len(os.path.join(root, ''))
+        names, offsets = bytearray(), array(INT64, [0])
+        devices, inodes, sizes, mtimes, types = (array(UINT64), array(UINT64), array(INT64),
+                                                 array(INT64), array('H'))
+        type_names, codes = [], {}
+        by_path = previous._index() if previous is not None else {}
+        by_inode = previous._inode_index() if previous is not None else {}
+
+        for entry, is_directory in entries(root, include_hidden_file, True, False):
+            try:
+                stat = entry.stat()
+            except OSError:  # e.g. a dangling symbolic link.
+                continue
+
+            relpath = entry.path[prefix:]
+            size = 0 if is_directory else stat.st_size
+            signature = (stat.st_dev, stat.st_ino, size, mtime_ns(stat))
+
+            if is_directory:
+                type_name = DIRECTORY
+            else:
+                type_name = _known_type(previous, by_path.get(relpath), signature) or \
+                    _known_type(previous, by_inode.get(signature[:2]), signature)
+                if type_name is None:
+                    type_name = type(PyFileInfo(entry.path, cache=cache).instance).__name__
+
+            if type_name not in codes:
+                codes[type_name] = len(type_names)
+                type_names.append(type_name)
+
+            names += relpath.encode(*ENCODING)
+            offsets.append(len(names))
+            devices.append(signature[0])
+            inodes.append(signature[1])
+            sizes.append(size)
+            mtimes.append(signature[3])
+            types.append(codes[type_name])
+
+        return cls(root, names, offsets, devices, inodes, sizes, mtimes, types, type_names)
+
+    def _index(self):
+        if self._positions is None:
+            self._positions = {self.relpath(idx): idx for idx in range(len(self))}
+
+        return self._positions
+
+    def _inode_index(self):
+        return {(self._devices[idx], self._inodes[idx]): idx for idx in range(len(self))}
+
+    def _signature(self, idx):
+        return self._devices[idx], self._inodes[idx], self._sizes[idx], self._mtimes[idx]
+
+
+def diff(old, new):
+    # Returns the SnapshotDiff from old to new, both of the same root. An entry is renamed
+    # when its inode, with the same size and modification time, moved to a path old didn't
+    # have, since a removed file's inode may be reused by a new one. It is modified when its
+    # path is kept but its inode, size, modification time or type changed. Directories are
+    # only added, removed or renamed, as their modification time follows their contents.
+    old_paths, new_paths = old._index(), new._index()
+
+    added = [path for path in new_paths if path not in old_paths]
+    removed = [path for path in old_paths if path not in new_paths]
+
+    modified = []
+    for path, idx in new_paths.items():
+        old_idx = old_paths.get(path)
+        if old_idx is None:
+            continue
+
+        old_entry, entry = old.entry(old_idx), new.entry(idx)
+        if entry.type == DIRECTORY and old_entry.type == DIRECTORY:
+            continue
+
+        if old_entry[1:] != entry[1:]:
+            modified.append(path)
+
+    renamed = []
+    added_by_inode = {}
+    for path in added:
+        added_by_inode.setdefault(_inode(new, new_paths[path]), path)
+
+    for path in removed:
+        key = _inode(old, old_paths[path])
+        target = added_by_inode.get(key)
+        if target is None:
+            continue
+
+        old_entry, entry = old.entry(old_paths[path]), new.entry(new_paths[target])
+        if old_entry.type == entry.type == DIRECTORY or old_entry[1:] == entry[1:]:
+            del added_by_inode[key]
+            renamed.append((path, target))
+
+    moved = set(target for _, target in renamed)
+    moved_from = set(path for path, _ in renamed)
+    return SnapshotDiff(added=sorted(path for path in added if path not in moved),
+                        removed=sorted(path for path in removed if path not in moved_from),
+                        modified=sorted(modified),
+                        renamed=sorted(renamed))
+
+
+def _inode(snapshot, idx):
+    return snapshot._devices[idx], snapshot._inodes[idx]
+
+
+def _known_type(snapshot, idx, signature):
+    # The type snapshot has at idx if that entry is unchanged, otherwise None.
+    if idx is None or snapshot._signature(idx) != signature:
+        return None
+
+    return snapshot._type_names[snapshot._types[idx]]
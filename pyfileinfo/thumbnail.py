@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+
+import os
+import uuid
+import traceback
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image as PILImage
+
+from pyfileinfo import instrument
+from pyfileinfo.pyfileinfo import PyFileInfo
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'pyfileinfo', 'thumbnails')
+
+ThumbnailResult = namedtuple('ThumbnailResult', ['path', 'thumbnail', 'error'])
+
+
+def thumbnail(path, size, cache_dir=None):
+    # Returns the path of a thumbnail of the image at path fitting in size. Thumbnails are
+    # stored under the digest of the source contents, so a source is rendered again only
+    # when it changes.
+    width, height = size
+    digest = PyFileInfo(path).hashes(['sha1'])['sha1']
+    directory = os.path.join(cache_dir or DEFAULT_CACHE_DIR, digest[:2])
+
+    for extension in ('.jpg', '.png'):
+        cached = os.path.join(directory, '{}_{}x{}{}'.format(digest, width, height, extension))
+        if os.path.exists(cached):
+            return cached
+
+    start = instrument.start()
+    image = _render(path, (width, height))
+    if start is not None:
+        instrument.emit('pil', 'thumbnail', start, path=path)
+    has_alpha = image.mode in ('RGBA', 'LA', 'PA')
+    destination = os.path.join(directory, '{}_{}x{}{}'.format(
+        digest, width, height, '.png' if has_alpha else '.jpg'))
+
+    if not os.path.isdir(directory):
+        try:
+            os.makedirs(directory)
+        except OSError:  # Made by another worker meanwhile.
+            if not os.path.isdir(directory):
+                raise
+
+    # Written aside and renamed, so that a thumbnail in the cache is always complete.
+    # Made with the permissions of any other new file, which mkstemp() wouldn't.
+    temporary = os.path.join(directory, '{}.tmp'.format(uuid.uuid4().hex))
+    fd = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            if has_alpha:
+                image.save(f, format='PNG', optimize=True)
+            else:
+                image.save(f, format='JPEG', quality=85)
+
+        os.rename(temporary, destination)
+    except Exception:  # noqa: E722
+        os.remove(temporary)
+        raise
+
+    return destination
+
+
+def thumbnails(paths, size, workers=None, cache_dir=None):
+    # Yields a ThumbnailResult per path, in order, rendering them on a process pool.
+    paths = list(paths)
+    with ProcessPoolExecutor(workers) as executor:
+        for result in executor.map(_thumbnail, paths, [size] * len(paths),
+                                   [cache_dir] * len(paths), chunksize=8):
+            yield result
+
+
+def _thumbnail(path, size, cache_dir):
+    try:
+        return ThumbnailResult(path, thumbnail(path, size, cache_dir=cache_dir), None)
+    except Exception:  # noqa: E722
+        return ThumbnailResult(path, None, traceback.format_exc())
+
+
+def _render(path, size):
+    with PILImage.open(path) as image:
+        # JPEG decodes straight to a scale no smaller than needed, 1/2 to 1/8.
+        image.draft('RGB', size)
+
+        # Then shrink by a whole factor cheaply, before the final resampling.
+        factor = min(image.width // size[0], image.height // size[1]) // 2
+        if factor > 1 and hasattr(image, 'reduce'):  # Pillow 7+
+            image = image.reduce(factor)
+        else:
+            image.load()
+
+    if image.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+        image = image.convert('RGBA' if 'A' in image.mode or 'transparency' in image.info
+                              else 'RGB')
+
+    image.thumbnail(size, PILImage.LANCZOS)
+    return image
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+
+import os
+import stat as stat_module
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+try:
+    from os import scandir
+except ImportError:
+    from scandir import scandir
+
+
+DEFAULT_WORKERS = 16
+
+
+def disk_usage(path, apparent=True, workers=None):
+    total = 0
+    for _, total in subtotals(path, apparent=apparent, workers=workers):
+        pass
+
+    return total
+
+
+def subtotals(path, apparent=True, workers=None):
+    # Yields (directory, size) for every subtree of path as soon as the whole subtree is
+    # known, path itself last. Subtrees are scanned concurrently and every inode is
+    # counted once, however many hard links reach it.
+    #
+    # With apparent=True, size is the sum of file sizes. Otherwise it is the space
+    # allocated to files and directories, like du, which doesn't follow symbolic links.
+    root = os.stat(path)
+    seen = set([(root.st_dev, root.st_ino)])
+    nodes = {path: _Node(path, None, 0 if apparent else _allocated(root))}
+
+    with ThreadPoolExecutor(workers or DEFAULT_WORKERS) as executor:
+        futures = {executor.submit(_scan_directory, path, apparent): path}
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                node = nodes[futures.pop(future)]
+                try:
+                    files, directories = future.result()
+                except OSError:
+                    if node.parent is None:
+                        raise
+
+                    files, directories = [], []  # Like du, go on with unreadable subtrees.
+
+                for file_stat in files:
+                    if file_stat.st_nlink > 1:
+                        key = (file_stat.st_dev, file_stat.st_ino)
+                        if key in seen:
+                            continue
+
+                        seen.add(key)
+
+                    node.total += file_stat.st_size if apparent else _allocated(file_stat)
+
+                for directory, directory_stat in directories:
+                    key = (directory_stat.st_dev, directory_stat.st_ino)
+                    if key in seen:  # Also guards against symbolic link loops.
+                        continue
+
+                    seen.add(key)
+                    nodes[directory] = _Node(directory, node,
+                                             0 if apparent else _allocated(directory_stat))
+                    node.pending += 1
+                    futures[executor.submit(_scan_directory, directory, apparent)] = directory
+
+                node.scanned = True
+                while node is not None and node.scanned and node.pending == 0:
+                    yield node.path, node.total
+
+                    del nodes[node.path]
+                    if node.parent is not None:
+                        node.parent.total += node.total
+                        node.parent.pending -= 1
+
+                    node = node.parent
+
+
+class _Node(object):
+    __slots__ = ('path', 'parent', 'total', 'pending', 'scanned')
+
+    def __init__(self, path, parent, total):
+        self.path = path
+        self.parent = parent
+        self.total = total
+        self.pending = 0
+        self.scanned = False
+
+
+def _scan_directory(path, follow_symlinks):
+    files = []
+    directories = []
+    for entry in scandir(path):
+        try:
+            entry_stat = entry.stat(follow_symlinks=follow_symlinks)
+        except OSError:  # Removed meanwhile, or a broken symbolic link.
+            continue
+
+        if stat_module.S_ISDIR(entry_stat.st_mode):
+            directories.append((entry.path, entry_stat))
+        else:
+            files.append(entry_stat)
+
+    return files, directories
+
+
+def _allocated(file_stat):
+    blocks = getattr(file_stat, 'st_blocks', None)
+    if blocks is None:
+        return file_stat.st_size
+
+    return blocks * 512
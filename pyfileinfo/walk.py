@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+
+try:
+    from os import scandir
+except ImportError:
+    from scandir import scandir
+
+from pyfileinfo.pyfileinfo import PyFileInfo, _natural_sort_key
+
+
+# How paths are stored in the UTF-8 buffers of Catalog and Snapshot.
+ENCODING = ('utf-8', 'surrogateescape')
+
+
+def walk(path, include_hidden_file=False, recursive=True, sort=True):
+    # Yields PyFileInfo objects in the same (pre)order as Directory.files_in, without
+    # detecting their type. Directories are known from their DirEntry, and the stat
+    # results the DirEntry already has are reused by PyFileInfo.stat().
+    stack = [_scan(path, include_hidden_file, sort)]
+    while stack:
+        item = next(stack[-1], None)
+        if item is None:
+            stack.pop()
+            continue
+
+        file, is_directory = item
+        yield file
+
+        if recursive and is_directory:
+            stack.append(_scan(file.path, include_hidden_file, sort))
+
+
+def entries(path, include_hidden_file=False, recursive=True, sort=True):
+    # Yields (DirEntry, is_directory) in the same order as walk(), skipping directories
+    # which can't be read.
+    stack = [_scan_entries(path, include_hidden_file, sort)]
+    while stack:
+        item = next(stack[-1], None)
+        if item is None:
+            stack.pop()
+            continue
+
+        yield item
+
+        entry, is_directory = item
+        if recursive and is_directory:
+            stack.append(_scan_entries(entry.path, include_hidden_file, sort))
+
+
+def scan(path, include_hidden_file=False):
+    # Returns the DirEntry objects directly in path.
+    return [entry for entry in scandir(path)
+            if include_hidden_file or not is_hidden_name(entry.name)]
+
+
+def is_hidden_name(name):
+    return name[:1] in ('.', '$', '@')
+
+
+def is_directory_entry(entry):
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def _scan(path, include_hidden_file, sort):
+    items = []
+    for entry in scan(path, include_hidden_file):
+        is_directory = is_directory_entry(entry)
+        items.append((PyFileInfo.from_entry(entry, is_directory), is_directory))
+
+    if sort:
+        # Not through sort_key, which would keep a key alive in every entry.
+        items.sort(key=lambda item: _natural_sort_key(item[0].path))
+
+    return iter(items)
+
+
+def _scan_entries(path, include_hidden_file, sort):
+    try:
+        items = scan(path, include_hidden_file)
+    except OSError:
+        return iter([])
+
+    if sort:
+        items.sort(key=lambda entry: _natural_sort_key(entry.name))
+
+    return iter([(entry, is_directory_entry(entry)) for entry in items])
@@ -0,0 +1,391 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+
+import os
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+from time import time
+from collections import namedtuple
+try:
+    from time import monotonic
+except ImportError:
+    monotonic = time
+
+from pyfileinfo.pyfileinfo import PyFileInfo
+from pyfileinfo.walk import walk, is_hidden_name
+
+
+DEFAULT_SETTLE_TIME = 1.0
+
+# kind is 'created', 'modified', 'moved' or 'deleted'. src_path is the former path of a
+# moved entry and file its PyFileInfo, None for deleted entries.
+WatchEvent = namedtuple('WatchEvent', ['kind', 'path', 'src_path', 'is_directory', 'file'])
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+IN_CLOEXEC = 0o2000000
+IN_NONBLOCK = 0o4000
+
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+              IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR)
+
+_EVENT = struct.Struct('iIII')
+
+
+class Watcher(object):
+    """Follows the changes to a directory tree through Linux inotify.
+
+    poll() returns WatchEvents, with the events of a file coalesced until its writes
+    have settled: it was closed after writing, or wasn't written to for settle_time
+    seconds. Created and modified files are then probed, and index maps the path of
+    every entry of the tree to its PyFileInfo.
+    """
+
+    def __init__(self, path, include_hidden_file=False, settle_time=DEFAULT_SETTLE_TIME,
+                 cache=None):
+        self._root = os.path.abspath(path)
+        self._include_hidden_file = include_hidden_file
+        self._settle_time = settle_time
+        self._cache = cache
+        self._fd = None
+        self._paths = {}  # watch descriptor -> directory
+        self._descriptors = {}  # directory -> watch descriptor
+        self._pending = {}  # path -> [kind, deadline]
+        self._ready = []
+        self._index = {}
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def index(self):
+        return self._index
+
+    def start(self):
+        libc = _libc()
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise _os_error()
+
+        self._watch(self._root)
+        self._index = {}
+        self._add_tree(self._root, emit=False)
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            self._paths.clear()
+            self._descriptors.clear()
+
+    def fileno(self):
+        return self._fd
+
+    def poll(self, timeout=None):
+        # Returns the events of the entries which settled, waiting up to timeout seconds, or
+        # until there is any if timeout is None.
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            events = self._settled()
+            if events:
+                return events
+
+            now = monotonic()
+            wait = None if deadline is None else max(0, deadline - now)
+            if self._pending:
+                settle = max(0, min(pending[1] for pending in self._pending.values()) - now)
+                wait = settle if wait is None else min(wait, settle)
+
+            readable, _, _ = select.select([self._fd], [], [], wait)
+            if readable:
+                self._read()
+            elif deadline is not None and monotonic() >= deadline:
+                return self._settled()
+
+    def events(self):
+        while True:
+            for event in self.poll():
+                yield event
+
+    def _read(self):
+        try:
+            buf = os.read(self._fd, 64 * 1024)
+        except OSError as e:
+            if e.errno == errno.EAGAIN:
+                return
+
+            raise
+
+        moves = {}  # cookie -> (path, is_directory)
+        offset = 0
+        while offset < len(buf):
+            wd, mask, cookie, length = _EVENT.unpack_from(buf, offset)
+            name = buf[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b'\0')
+            offset += _EVENT.size + length
+
+            if mask & IN_Q_OVERFLOW:
+                self._resync()
+                continue
+
+            if mask & IN_IGNORED:
+                self._forget(self._paths.get(wd))
+                continue
+
+            directory = self._paths.get(wd)
+            if directory is None or mask & IN_DELETE_SELF:
+                continue
+
+            name = _decode(name)
+            if not self._include_hidden_file and is_hidden_name(name):
+                continue
+
+            path = os.path.join(directory, name)
+            is_directory = bool(mask & IN_ISDIR)
+            if mask & IN_MOVED_FROM:
+                moves[cookie] = (path, is_directory)
+            elif mask & IN_MOVED_TO:
+                if cookie in moves:
+                    self._moved(moves.pop(cookie)[0], path, is_directory)
+                else:  # From outside of the tree.
+                    self._created(path, is_directory)
+            elif mask & IN_CREATE:
+                self._created(path, is_directory)
+            elif mask & IN_DELETE:
+                self._deleted(path, is_directory)
+            elif mask & IN_CLOSE_WRITE:
+                self._touched(path, settled=True)
+            elif mask & IN_MODIFY:
+                self._touched(path, settled=False)
+
+        # Moved out of the tree.
+        for path, is_directory in moves.values():
+            self._deleted(path, is_directory)
+
+    def _created(self, path, is_directory):
+        if is_directory:
+            self._add_tree(path, emit=True)
+        else:
+            self._touch(path, 'created', settled=False)
+
+    def _touched(self, path, settled):
+        kind = 'modified' if path in self._index else 'created'
+        self._touch(path, kind, settled)
+
+    def _touch(self, path, kind, settled):
+        pending = self._pending.get(path)
+        if pending is not None and pending[0] in ('created', 'modified'):
+            kind = pending[0]
+        elif pending is not None:  # Deleted, then made again.
+            kind = 'modified'
+
+        self._pending[path] = [kind, monotonic() + (0 if settled else self._settle_time)]
+
+    def _deleted(self, path, is_directory):
+        pending = self._pending.pop(path, None)
+        if pending is None and path not in self._index:
+            return
+
+        self._index.pop(path, None)
+        if is_directory:
+            for entry in [entry for entry in self._index if _is_within(entry, path)]:
+                del self._index[entry]
+                self._pending.pop(entry, None)
+
+            self._forget(path, unwatch=True)
+
+        if pending is not None and pending[0] == 'created':
+            return  # Never reported.
+
+        self._pending[path] = ['deleted', monotonic(), is_directory]
+
+    def _moved(self, src_path, path, is_directory):
+        if is_directory:
+            for mapping in (self._descriptors, self._index, self._pending):
+                for entry in [entry for entry in mapping if _is_within(entry, src_path)]:
+                    if mapping is self._pending and mapping[entry][0] == 'deleted':
+                        continue  # Deleted before the move, under its former path.
+
+                    mapping[path + entry[len(src_path):]] = mapping.pop(entry)
+
+            for wd, directory in list(self._paths.items()):
+                if _is_within(directory, src_path):
+                    self._paths[wd] = path + directory[len(src_path):]
+
+            for entry in list(self._index):
+                if _is_within(entry, path):
+                    self._add(PyFileInfo(entry, cache=self._cache))
+
+            self._emit(WatchEvent('moved', path, src_path, True, self._index.get(path)))
+            return
+
+        pending = self._pending.pop(src_path, None)
+        self._index.pop(src_path, None)
+        if pending is not None and pending[0] != 'deleted':
+            # Still being written, it is reported once settled under its new path.
+            self._pending[path] = pending
+            return
+
+        file = PyFileInfo(path, cache=self._cache)
+        self._add(file)
+        self._emit(WatchEvent('moved', path, src_path, False, file))
+
+    def _add_tree(self, path, emit):
+        # Watches path and the directories in it, indexing what they contain. Files made
+        # while the watches were added are found by the walk, and again by inotify.
+        if path != self._root:
+            self._watch(path)
+            directory = PyFileInfo(path, cache=self._cache)
+            self._add(directory)
+            if emit:
+                self._emit(WatchEvent('created', path, None, True, directory))
+
+        try:
+            files = list(walk(path, include_hidden_file=self._include_hidden_file, sort=False))
+        except OSError:
+            return
+
+        for file in files:
+            if file.is_directory():
+                self._watch(file.path)
+                self._add(file)
+                if emit:
+                    self._emit(WatchEvent('created', file.path, None, True, file))
+            elif emit:
+                self._touch(file.path, 'created', settled=False)
+            else:
+                self._add(file)
+
+    def _add(self, file):
+        # Indexes file with its stat taken now, which _resync() compares with.
+        try:
+            file.stat()
+        except OSError:  # Removed meanwhile.
+            self._index.pop(file.path, None)
+            return
+
+        self._index[file.path] = file
+
+    def _watch(self, path):
+        wd = _libc().inotify_add_watch(self._fd, _encode(path), WATCH_MASK)
+        if wd < 0:
+            error = _os_error()
+            if error.errno in (errno.ENOENT, errno.ENOTDIR):
+                return  # Removed meanwhile.
+
+            raise error
+
+        self._paths[wd] = path
+        self._descriptors[path] = wd
+
+    def _forget(self, path, unwatch=False):
+        if path is None:
+            return
+
+        for directory in [directory for directory in self._descriptors
+                          if _is_within(directory, path)]:
+            wd = self._descriptors.pop(directory)
+            self._paths.pop(wd, None)
+            if unwatch:
+                _libc().inotify_rm_watch(self._fd, wd)
+
+    def _resync(self):
+        # The kernel dropped events: compares the tree with the index instead.
+        known = self._index
+        self._index = {}
+        self._add_tree(self._root, emit=False)
+        current = self._index
+        self._index = known
+
+        for path in [path for path in known if path not in current]:
+            self._deleted(path, known[path].is_directory())
+
+        for path, file in current.items():
+            if path not in known:
+                self._created(path, file.is_directory())
+            elif not file.is_directory():
+                old, new = known[path].stat(), file.stat()  # Both taken when indexed.
+                if (old.st_ino, old.st_size, old.st_mtime) != \
+                        (new.st_ino, new.st_size, new.st_mtime):
+                    self._touch(path, 'modified', settled=False)
+
+    def _settled(self):
+        now = monotonic()
+        paths = sorted((pending[1], path) for path, pending in self._pending.items()
+                       if pending[1] <= now)
+
+        events = self._ready
+        self._ready = []
+        for _, path in paths:
+            pending = self._pending.pop(path)
+            if pending[0] == 'deleted':
+                events.append(WatchEvent('deleted', path, None, pending[2], None))
+                continue
+
+            file = PyFileInfo(path, cache=self._cache)
+            try:
+                file.stat()
+                file.instance  # Probed now that it is complete.
+            except (IOError, OSError):  # Removed meanwhile.
+                continue
+
+            self._index[path] = file
+            events.append(WatchEvent(pending[0], path, None, False, file))
+
+        return events
+
+    def _emit(self, event):
+        self._ready.append(event)
+
+
+def _is_within(path, directory):
+    return path == directory or path.startswith(os.path.join(directory, ''))
+
+
+def _encode(path):
+    return path.encode('utf-8', 'surrogateescape') if not isinstance(path, bytes) else path
+
+
+def _decode(name):
+    return name.decode('utf-8', 'surrogateescape')
+
+
+def _os_error():
+    code = ctypes.get_errno()
+    return OSError(code, os.strerror(code))
+
+
+_libc_instance = None
+
+
+def _libc():
+    global _libc_instance
+
+    if _libc_instance is None:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, 'inotify is not available')
+
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        _libc_instance = libc
+
+    return _libc_instance
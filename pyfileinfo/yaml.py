@@ -2,24 +2,33 @@
 
 from __future__ import absolute_import
 
-import yaml
+import os
 from io import open
 try:
     from collections.abc import Sequence
 except ImportError:
     from collections import Sequence
 
+from pyfileinfo import registry
 from pyfileinfo.file import File
 
 
 class YAML(File, Sequence):
-    def __init__(self, file_path):
+    __slots__ = ('_instance',)
+
+    # Files at least this large are validated by parsing their events only, and loaded on
+    # first use. Smaller ones are loaded once, by probe().
+    STREAMING_THRESHOLD = 16 * 1024 * 1024
+
+    def __init__(self, file_path, instance=None):
         File.__init__(self, file_path)
         Sequence.__init__(self)
 
-        self._instance = None
+        self._instance = instance
 
     def __str__(self):
+        import yaml
+
         return '%s\n%s' % (self.path, yaml.dump(self.instance))
 
     def __getitem__(self, item):
@@ -29,24 +38,88 @@ class YAML(File, Sequence):
         return len(self.instance)
 
     def __getattr__(self, item):
+        if item.startswith('_'):
+            raise AttributeError(item)
+
         return getattr(self.instance, item)
 
     @staticmethod
     def hint():
         return ['.yml']
 
+    @staticmethod
+    def sniff(header):
+        if header is None or b'\x00' in header:
+            return False
+
+        # The header may end in the middle of a multibyte character.
+        for cut in range(4):
+            try:
+                header[:len(header) - cut].decode('utf8')
+            except UnicodeDecodeError:
+                continue
+
+            return True
+
+        return False
+
     @staticmethod
     def is_valid(path):
+        return YAML.probe(path) is not None
+
+    @classmethod
+    def probe(cls, path, profile=None):
+        import yaml
+
         try:
-            yaml.load(open(path, encoding='utf8'))
+            if os.path.getsize(path) < cls.STREAMING_THRESHOLD:
+                return cls(path, _load(path))
+
+            with open(path, encoding='utf8') as f:
+                for _ in yaml.parse(f, Loader=_loader()):
+                    pass
         except Exception:  # noqa: E722
-            return False
+            return None
 
-        return True
+        return cls(path)
+
+    def documents(self):
+        # Yields the documents of the stream one by one.
+        import yaml
+
+        with open(self.path, encoding='utf8') as f:
+            for document in yaml.load_all(f, Loader=_loader()):
+                yield document
 
     @property
     def instance(self):
         if self._instance is None:
-            self._instance = yaml.load(open(self.path, encoding='utf8'))
+            self._instance = _load(self.path)
 
         return self._instance
+
+
+registry.register(YAML, priority=10)
+
+
+def _load(path):
+    # A stream of several documents is loaded as the list of them.
+    import yaml
+
+    with open(path, encoding='utf8') as f:
+        documents = list(yaml.load_all(f, Loader=_loader()))
+
+    if len(documents) == 0:
+        return None
+
+    if len(documents) == 1:
+        return documents[0]
+
+    return documents
+
+
+def _loader():
+    # libyaml's loader when PyYAML was built with it, otherwise the pure Python one.
+    import yaml
+
+    return getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
@@ -23,6 +23,8 @@ REQUIREMENTS = [
     'pymediainfo',
     'future',
     'six',
+    'scandir; python_version < "3.5"',
+    'futures; python_version < "3"',
 ]
 
 EXTRAS_REQUIRE = {
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+
+import os
+import asyncio
+import unittest
+
+from pyfileinfo import PyFileInfo, Image, aio
+from tests import DATA_ROOT
+
+
+class TestAsyncIO(unittest.TestCase):
+    def tearDown(self):
+        aio.configure()
+
+    def test_probe_and_hash(self):
+        async def main():
+            image = PyFileInfo(os.path.join(DATA_ROOT, '5x5.jpg'))
+            md5 = PyFileInfo(os.path.join(DATA_ROOT, 'md5_bc67678e92933a5f1c60ac5a7f65f9bb'))
+            return await asyncio.gather(image.aprobe(), md5.amd5(), md5.ahashes(['md5']),
+                                        md5.asize())
+
+        instance, md5, hashes, size = asyncio.run(main())
+        self.assertTrue(isinstance(instance, Image))
+        self.assertEqual(md5, 'bc67678e92933a5f1c60ac5a7f65f9bb')
+        self.assertEqual(hashes, {'md5': 'bc67678e92933a5f1c60ac5a7f65f9bb'})
+        self.assertEqual(size, 14)
+
+    def test_files_in(self):
+        aio.configure(max_workers=2, concurrency=1)
+
+        async def main():
+            directory = PyFileInfo(DATA_ROOT)
+            return [file.path async for file in directory.afiles_in(recursive=True)]
+
+        self.assertEqual(asyncio.run(main()),
+                         [file.path for file in PyFileInfo(DATA_ROOT).files_in(recursive=True)])
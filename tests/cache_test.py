@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+from io import open
+
+import mock
+
+from pymediainfo import MediaInfo
+from pyfileinfo import PyFileInfo, Image, Medium
+from pyfileinfo.cache import MetadataCache
+from tests import DATA_ROOT
+
+
+class TestMetadataCache(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.cache = MetadataCache(os.path.join(self.root, 'cache.sqlite'))
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.root)
+
+    def test_store_and_load(self):
+        path = self._copy('dict.json')
+        self.assertIsNone(self.cache.load(path))
+
+        self.cache.store(path, type='JSON', digests={'md5': 'abc'})
+        self.cache.store(path, digests={'sha1': 'def'})
+
+        entry = self.cache.load(path)
+        self.assertEqual(entry.type, 'JSON')
+        self.assertEqual(entry.digests, {'md5': 'abc', 'sha1': 'def'})
+
+    def test_invalidated_by_modification(self):
+        path = self._copy('dict.json')
+        self.cache.store(path, type='JSON')
+
+        with open(path, 'ab') as f:
+            f.write(b'\n')
+
+        self.assertIsNone(self.cache.load(path))
+
+    def test_cached_type(self):
+        path = self._copy('5x5.jpg')
+        self.assertTrue(isinstance(PyFileInfo(path, cache=self.cache).instance, Image))
+
+        with mock.patch('PIL.Image.open') as mock_open:
+            image = PyFileInfo(path, cache=self.cache)
+            self.assertTrue(isinstance(image.instance, Image))
+            self.assertEqual(image.resolution, (5, 5))
+            self.assertFalse(mock_open.called)
+
+    @mock.patch('pymediainfo.MediaInfo.parse')
+    def test_cached_medium(self, mock_mediainfo):
+        xml_path = os.path.join(DATA_ROOT, 'mediainfo/pooq.xml')
+        mock_mediainfo.return_value = MediaInfo(open(xml_path, encoding='utf-8').read())
+
+        path = self._copy('empty.mp4')
+        self.assertEqual(PyFileInfo(path, cache=self.cache).duration, 5022.400)
+
+        medium = PyFileInfo(path, cache=self.cache)
+        self.assertTrue(isinstance(medium.instance, Medium))
+        self.assertEqual(medium.duration, 5022.400)
+        self.assertEqual(medium.video_tracks[0].codec, 'AVC')
+        self.assertEqual(medium.audio_tracks[0].channels, 2)
+        self.assertEqual(mock_mediainfo.call_count, 1)
+
+    @mock.patch('pymediainfo.MediaInfo.parse')
+    def test_cached_medium_profile(self, mock_mediainfo):
+        xml_path = os.path.join(DATA_ROOT, 'mediainfo/pooq.xml')
+        mock_mediainfo.return_value = MediaInfo(open(xml_path, encoding='utf-8').read())
+
+        path = self._copy('empty.mp4')
+        self.assertEqual(PyFileInfo(path, cache=self.cache, profile='header').instance.profile,
+                         'header')
+        self.assertEqual(mock_mediainfo.call_args[1]['parse_speed'], 0)
+
+        # Read again, deeper, and kept in place of the shallower entry.
+        self.assertEqual(PyFileInfo(path, cache=self.cache, profile='full').instance.profile,
+                         'full')
+        self.assertEqual(mock_mediainfo.call_args[1]['parse_speed'], 1)
+        self.assertEqual(mock_mediainfo.call_count, 2)
+
+        for profile in (None, 'header', 'full'):
+            self.assertEqual(PyFileInfo(path, cache=self.cache, profile=profile).instance.profile,
+                             'full')
+        self.assertEqual(mock_mediainfo.call_count, 2)
+
+    def test_cached_md5(self):
+        path = self._copy('md5_bc67678e92933a5f1c60ac5a7f65f9bb')
+        self.assertEqual(PyFileInfo(path, cache=self.cache).md5,
+                         'bc67678e92933a5f1c60ac5a7f65f9bb')
+
+        with mock.patch('hashlib.md5') as mock_md5:
+            mock_md5.return_value.name = 'md5'
+            self.assertEqual(PyFileInfo(path, cache=self.cache).md5,
+                             'bc67678e92933a5f1c60ac5a7f65f9bb')
+
+    def test_default_cache(self):
+        path = self._copy('dict.json')
+        PyFileInfo.default_cache = self.cache
+        try:
+            PyFileInfo(path).instance
+        finally:
+            PyFileInfo.default_cache = None
+
+        self.assertEqual(self.cache.load(path).type, 'JSON')
+
+    def _copy(self, name):
+        path = os.path.join(self.root, name)
+        shutil.copy(os.path.join(DATA_ROOT, name), path)
+        return path
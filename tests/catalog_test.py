@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from pyfileinfo import PyFileInfo, catalog
+from pyfileinfo.catalog import Catalog
+from pyfileinfo.file import mtime_ns
+from tests import DATA_ROOT
+
+
+class TestCatalog(unittest.TestCase):
+    def setUp(self):
+        self.catalog = PyFileInfo(DATA_ROOT).catalog()
+
+    def test_columns(self):
+        paths = list(self.catalog.paths())
+        self.assertEqual(paths, [file.path for file in
+                                 PyFileInfo(DATA_ROOT).files_in(recursive=True)])
+        self.assertEqual(len(self.catalog), len(paths))
+
+        idx = paths.index(os.path.join(DATA_ROOT, 'dict.json'))
+        self.assertEqual(self.catalog.relpath(idx), 'dict.json')
+        self.assertEqual(self.catalog.type_name(idx), 'JSON')
+        self.assertEqual(self.catalog.column('sizes')[idx], 20)
+        self.assertEqual(self.catalog.column('mtimes')[idx],
+                         mtime_ns(os.stat(os.path.join(DATA_ROOT, 'dict.json'))))
+        self.assertFalse(self.catalog.has_media)
+
+    def test_aggregates(self):
+        self.assertEqual(self.catalog.count_by_type(),
+                         {'Directory': 2, 'File': 2, 'Image': 1, 'JSON': 2, 'Medium': 1,
+                          'YAML': 7})
+        self.assertEqual(self.catalog.size_by_type()['JSON'], 51)
+        self.assertNotIn('Directory', self.catalog.size_by_type())
+        self.assertEqual(self.catalog.total_size(),
+                         sum(file.size for file in PyFileInfo(DATA_ROOT).files_in(recursive=True)
+                             if not file.is_directory()))
+
+        with self.assertRaises(ValueError):
+            self.catalog.duration_by_type()
+
+    def test_filter(self):
+        jsons = self.catalog.filter(type='JSON')
+        self.assertEqual(list(jsons.paths()), [os.path.join(DATA_ROOT, 'dict.json'),
+                                               os.path.join(DATA_ROOT, 'list.json')])
+        self.assertEqual(jsons.total_size(), 51)
+
+        large = self.catalog.filter(type=['Image', 'Medium', 'YAML'], min_size=100)
+        self.assertEqual([os.path.basename(path) for path in large.paths()],
+                         ['5x5.jpg', 'empty.mp4'])
+        self.assertEqual(len(self.catalog.filter(max_size=3, type='YAML')), 3)
+        self.assertEqual(len(self.catalog.filter(modified_after=2 ** 32)), 0)
+        self.assertEqual(len(self.catalog.filter(type='Unknown')), 0)
+
+    def test_media(self):
+        media = PyFileInfo(DATA_ROOT).catalog(media=True)
+        rows = {os.path.basename(row[0]): row for row in media.rows()}
+        self.assertEqual(rows['empty.mp4'][3:], ('Medium', 5.047, 320, 240))
+        self.assertEqual(rows['5x5.jpg'][5:], (5, 5))
+        self.assertEqual(rows['dict.json'][5:], (-1, -1))
+        self.assertEqual(media.duration_by_type(), {'Medium': 5.047})
+        self.assertEqual(media.total_duration(), 5.047)
+
+    def test_detect_by_extension(self):
+        with mock.patch.object(PyFileInfo, '_detect') as mock_detect:
+            by_extension = Catalog.build(DATA_ROOT, detect='extension')
+            self.assertFalse(mock_detect.called)
+
+        self.assertEqual(by_extension.count_by_type(),
+                         {'Directory': 2, 'File': 7, 'Image': 1, 'JSON': 2, 'Medium': 1,
+                          'YAML': 2})
+        self.assertEqual(set(PyFileInfo(DATA_ROOT).catalog(detect=None).type_names),
+                         {'Directory', 'File'})
+
+        with self.assertRaises(ValueError):
+            PyFileInfo(DATA_ROOT).catalog(detect='extension', media=True)
+
+    def test_non_ascii_and_empty(self):
+        root = tempfile.mkdtemp()
+        try:
+            self.assertEqual(len(Catalog.build(root)), 0)
+            self.assertEqual(Catalog.build(root).total_size(), 0)
+
+            with open(os.path.join(root, u'파일 2.txt'), 'wb') as f:
+                f.write(b'\x00\x01')
+
+            self.assertEqual(list(Catalog.build(root).paths()), [os.path.join(root, u'파일 2.txt')])
+        finally:
+            shutil.rmtree(root)
+
+    @unittest.skipIf(catalog.numpy is None, 'requires NumPy')
+    def test_numpy(self):
+        sizes = self.catalog.column('sizes')
+        self.assertEqual(int(sizes.sum()), sum(self.catalog.size_by_type().values()))
+
+        with mock.patch.object(catalog, 'numpy', None):
+            expected = (self.catalog.count_by_type(), self.catalog.size_by_type(),
+                        list(self.catalog.filter(type='YAML', min_size=5).paths()))
+
+        self.assertEqual((self.catalog.count_by_type(), self.catalog.size_by_type(),
+                          list(self.catalog.filter(type='YAML', min_size=5).paths())), expected)
@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+
+import sys
+
+
+collect_ignore = []
+if sys.version_info < (3, 6):  # async comprehensions
+    collect_ignore.append('aio_test.py')
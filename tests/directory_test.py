@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 
 import os
+import shutil
+import tempfile
 import unittest
 
+import mock
+
 from pyfileinfo import PyFileInfo, Directory
 from tests import DATA_ROOT
 
@@ -24,6 +28,31 @@ class TestDirectory(unittest.TestCase):
         file = PyFileInfo(DATA_ROOT)
         self.assertEqual(len(list(file.files_in(recursive=True))), 15)
 
+    def test_files_in_order(self):
+        file = PyFileInfo(DATA_ROOT)
+        names = [sub_file.relpath(DATA_ROOT) for sub_file in file.files_in(recursive=True)]
+        self.assertEqual(names[:3], ['5x5.jpg', 'dict.json', 'dict.yml'])
+        self.assertEqual(names[-5:], ['text_files',
+                                      os.path.join('text_files', 'diff.txt'),
+                                      os.path.join('text_files', 'diff_size.txt'),
+                                      os.path.join('text_files', 'original.txt'),
+                                      os.path.join('text_files', 'same.txt')])
+
+    def test_unsorted_files_in(self):
+        file = PyFileInfo(DATA_ROOT)
+        self.assertEqual([sub_file.path for sub_file in sorted(file.files_in(sort=False))],
+                         [sub_file.path for sub_file in file.files_in()])
+
+    def test_files_in_does_not_detect(self):
+        file = PyFileInfo(DATA_ROOT)
+        file.instance
+
+        with mock.patch.object(PyFileInfo, '_detect') as mock_detect:
+            sub_files = list(file.files_in(recursive=True))
+            self.assertTrue(sub_files[-5].is_directory())
+            self.assertEqual(sub_files[0].stat().st_size, 10844)
+            self.assertFalse(mock_detect.called)
+
     def test_hidden_file(self):
         file = PyFileInfo(DATA_ROOT)
         self.assertEqual(len(list(file.files_in(include_hidden_file=True))), 10)
@@ -31,3 +60,63 @@ class TestDirectory(unittest.TestCase):
     def test_size(self):
         file = PyFileInfo(os.path.join(DATA_ROOT))
         self.assertEqual(file.size, 128149)
+
+    def test_size_counts_hard_links_once(self):
+        root = tempfile.mkdtemp()
+        try:
+            os.mkdir(os.path.join(root, 'sub'))
+            with open(os.path.join(root, 'a.txt'), 'wb') as f:
+                f.write(b'x' * 100)
+            os.link(os.path.join(root, 'a.txt'), os.path.join(root, 'sub', 'b.txt'))
+
+            directory = PyFileInfo(root)
+            self.assertEqual(directory.size, 100)
+            self.assertGreaterEqual(directory.disk_usage(apparent=False), 100)
+        finally:
+            shutil.rmtree(root)
+
+    @unittest.skipIf(not hasattr(os, 'symlink'), 'requires symbolic links')
+    def test_disk_usage_does_not_follow_symbolic_links(self):
+        root = tempfile.mkdtemp()
+        try:
+            os.mkdir(os.path.join(root, 'tree'))
+            os.mkdir(os.path.join(root, 'outside'))
+            with open(os.path.join(root, 'outside', 'a.txt'), 'wb') as f:
+                f.write(b'x' * 1024 * 1024)
+            os.symlink(os.path.join(root, 'outside'), os.path.join(root, 'tree', 'link'))
+
+            directory = PyFileInfo(os.path.join(root, 'tree'))
+            self.assertEqual(directory.size, 1024 * 1024)
+            self.assertLess(directory.disk_usage(apparent=False), 1024 * 1024)
+        finally:
+            shutil.rmtree(root)
+
+    def test_find_duplicates(self):
+        file = PyFileInfo(DATA_ROOT)
+        groups = [[sub_file.path for sub_file in group] for group in file.find_duplicates()]
+
+        self.assertEqual(groups, [[os.path.join(DATA_ROOT, 'text_files', 'original.txt'),
+                                   os.path.join(DATA_ROOT, 'text_files', 'same.txt')]])
+
+    def test_find_duplicates_of_large_files(self):
+        root = tempfile.mkdtemp()
+        try:
+            for name, tail in [('a', b'1'), ('b', b'1'), ('c', b'2'), ('d', b'1')]:
+                with open(os.path.join(root, name), 'wb') as f:
+                    f.write(b'x' * 100 + tail + b'y' * 100)
+            os.link(os.path.join(root, 'a'), os.path.join(root, 'e'))
+
+            directory = PyFileInfo(root)
+            groups = [[sub_file.name for sub_file in group]
+                      for group in directory.find_duplicates(sample_size=10)]
+            self.assertEqual(groups, [['a', 'b', 'd']])
+        finally:
+            shutil.rmtree(root)
+
+    def test_subtotals(self):
+        file = PyFileInfo(DATA_ROOT)
+        subtotals = list(file.subtotals(workers=2))
+
+        self.assertEqual(subtotals[-1], (DATA_ROOT, 128149))
+        self.assertEqual(dict(subtotals)[os.path.join(DATA_ROOT, 'text_files')], 14)
+        self.assertEqual(dict(subtotals)[os.path.join(DATA_ROOT, 'mediainfo')], 48449)
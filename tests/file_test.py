@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
 
 import os
+import shutil
+import pickle
+import hashlib
+import tempfile
 import unittest
 
-from pyfileinfo import PyFileInfo
+import mock
+
+from pyfileinfo import PyFileInfo, File, natural_sort_key
 from tests import DATA_ROOT
 
 
@@ -40,6 +46,110 @@ class TestFile(unittest.TestCase):
         self.assertTrue(file1 != file2)
         self.assertTrue(file1 != os.path.join(DATA_ROOT, 'text_files', 'diff_size.txt'))
 
+    def test_modified_file(self):
+        root = tempfile.mkdtemp()
+        path, other_path = os.path.join(root, 'a'), os.path.join(root, 'b')
+        try:
+            self._write(path, b'first', 1000000000)
+            self._write(other_path, b'other', 1000000000)
+            file, other = PyFileInfo(path), PyFileInfo(other_path)
+            self.assertEqual(file.md5, hashlib.md5(b'first').hexdigest())
+            other.md5
+            self.assertTrue(file != other)
+
+            # Same size, as well as same contents as other now.
+            self._write(path, b'other', 2000000000)
+            self.assertEqual(file.md5, hashlib.md5(b'other').hexdigest())
+            self.assertTrue(file == other)
+
+            self._write(path, b'longer', 3000000000)
+            self.assertTrue(file != other)
+        finally:
+            shutil.rmtree(root)
+
+    def _write(self, path, content, mtime_ns):
+        with open(path, 'wb') as f:
+            f.write(content)
+        os.utime(path, (mtime_ns / 1e9, mtime_ns / 1e9))
+
+    def test_unknown_binary_is_not_fully_parsed(self):
+        with tempfile.NamedTemporaryFile(suffix='.bin') as f:
+            f.write(b'\x00\x01\x02\x03' * 1024)
+            f.flush()
+
+            with mock.patch('pymediainfo.MediaInfo.parse') as mock_mediainfo:
+                file = PyFileInfo(f.name)
+                self.assertEqual(type(file.instance), File)
+                self.assertFalse(mock_mediainfo.called)
+
+    def test_equality_without_reading(self):
+        original = os.path.join(DATA_ROOT, 'text_files', 'original.txt')
+        with mock.patch('pyfileinfo.pyfileinfo._compare_contents') as mock_compare:
+            self.assertTrue(PyFileInfo(original) == PyFileInfo(original))
+            self.assertTrue(PyFileInfo(original) != os.path.join(DATA_ROOT, 'text_files',
+                                                                 'diff_size.txt'))
+
+            file1 = PyFileInfo(original)
+            file2 = PyFileInfo(os.path.join(DATA_ROOT, 'text_files', 'diff.txt'))
+            file1.md5, file2.md5
+            self.assertTrue(file1 != file2)
+            self.assertFalse(mock_compare.called)
+
+    def test_samepath(self):
+        file = PyFileInfo(os.path.join(DATA_ROOT, 'text_files', 'original.txt'))
+
+        self.assertTrue(file.samepath(os.path.join(DATA_ROOT, 'text_files', '..', 'text_files',
+                                                   'original.txt')))
+        self.assertFalse(file.samepath(PyFileInfo(os.path.join(DATA_ROOT, 'text_files',
+                                                               'same.txt'))))
+
+    def test_natural_sort(self):
+        paths = ['Ep10.mp4', 'ep2.mp4', 'ep1.mp4', 'ep1b.mp4', 'special.mp4']
+        expected = ['ep1.mp4', 'ep1b.mp4', 'ep2.mp4', 'Ep10.mp4', 'special.mp4']
+
+        self.assertEqual(sorted(paths, key=natural_sort_key), expected)
+        self.assertEqual([file.path for file in sorted(PyFileInfo(path) for path in paths)],
+                         expected)
+
     def test_md5(self):
         md5 = PyFileInfo(os.path.join(DATA_ROOT, 'md5_bc67678e92933a5f1c60ac5a7f65f9bb'))
         self.assertEqual(md5.md5, 'bc67678e92933a5f1c60ac5a7f65f9bb')
+
+    def test_hashes(self):
+        path = os.path.join(DATA_ROOT, 'md5_bc67678e92933a5f1c60ac5a7f65f9bb')
+        with open(path, 'rb') as f:
+            content = f.read()
+
+        expected = {'md5': 'bc67678e92933a5f1c60ac5a7f65f9bb',
+                    'sha1': hashlib.sha1(content).hexdigest(),
+                    'sha256': hashlib.sha256(content).hexdigest()}
+
+        # A new PyFileInfo each time, as one reuses the digests it computed.
+        algorithms = ['md5', 'sha1', 'sha256']
+        self.assertEqual(PyFileInfo(path).hashes(algorithms), expected)
+        self.assertEqual(PyFileInfo(path).hashes(algorithms, buffer_size=3), expected)
+        self.assertEqual(PyFileInfo(path).hashes(algorithms, buffer_size=3, use_mmap=True),
+                         expected)
+
+        with mock.patch('pyfileinfo.hashing._MMAP_VIEWS', False):
+            self.assertEqual(PyFileInfo(path).hashes(algorithms, use_mmap=True), expected)
+
+    def test_hashes_of_empty_file(self):
+        file = PyFileInfo(os.path.join(DATA_ROOT, '.hidden'))
+        self.assertEqual(file.hashes(['md5'], use_mmap=True),
+                         {'md5': hashlib.md5(b'').hexdigest()})
+
+    def test_slots(self):
+        file = PyFileInfo(os.path.join(DATA_ROOT, 'text_files', 'original.txt'))
+        other = PyFileInfo(os.path.join(DATA_ROOT, 'text_files', 'same.txt'))
+        self.assertFalse(hasattr(file, '__dict__'))
+        self.assertFalse(hasattr(file.instance, '__dict__'))
+        self.assertEqual(file.path, os.path.join(DATA_ROOT, 'text_files', 'original.txt'))
+        self.assertEqual(file.name, 'original.txt')
+
+        # Entries of one directory share its path.
+        self.assertIs(file._prefix, other._prefix)
+
+        copy = pickle.loads(pickle.dumps(file))
+        self.assertEqual(copy.path, file.path)
+        self.assertEqual(hash(copy), hash(file))
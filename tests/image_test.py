@@ -1,9 +1,16 @@
 # -*- coding: utf-8 -*-
 
 import os
+import stat
+import shutil
+import tempfile
 import unittest
 
+import mock
+from PIL import Image as PILImage
+
 from pyfileinfo import PyFileInfo, Image
+from pyfileinfo.imageheader import ImageHeader, read_header
 from tests import DATA_ROOT
 
 
@@ -21,6 +28,101 @@ class TestImage(unittest.TestCase):
         self.assertEqual(image.width, 5)
         self.assertEqual(image.height, 5)
 
+    def test_sniff(self):
+        with open(os.path.join(DATA_ROOT, '5x5.jpg'), 'rb') as f:
+            self.assertTrue(Image.sniff(f.read(4096)))
+
+        self.assertTrue(Image.sniff(b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR'))
+        self.assertTrue(Image.sniff(b'RIFF\x00\x00\x00\x00WEBPVP8 '))
+        self.assertFalse(Image.sniff(b'RIFF\x00\x00\x00\x00AVI LIST'))
+        self.assertFalse(Image.sniff(None))
+
     def test_resolution(self):
         image = PyFileInfo(os.path.join(DATA_ROOT, '5x5.jpg'))
         self.assertEqual(image.resolution, (5, 5))
+
+    def test_header_without_pil(self):
+        with mock.patch('PIL.Image.open') as mock_open:
+            image = PyFileInfo(os.path.join(DATA_ROOT, '5x5.jpg'))
+            self.assertTrue(image.is_image())
+            self.assertEqual(image.resolution, (5, 5))
+            self.assertEqual((image.format, image.mode), ('JPEG', 'RGB'))
+            self.assertFalse(mock_open.called)
+
+    def test_pixels_with_closed_file(self):
+        image = PyFileInfo(os.path.join(DATA_ROOT, '5x5.jpg'))
+        self.assertEqual(len(image.getpixel((0, 0))), 3)
+        self.assertIsNone(image.image.fp)
+
+    def test_read_header_matches_pil(self):
+        root = tempfile.mkdtemp()
+        try:
+            samples = [('png', mode, {}) for mode in ['1', 'L', 'LA', 'P', 'RGB', 'RGBA', 'I;16']]
+            samples += [('jpeg', mode, {}) for mode in ['L', 'RGB', 'CMYK']]
+            samples += [('jpeg', 'RGB', {'progressive': True, 'exif': b'Exif\x00\x00' * 100})]
+            samples += [('bmp', 'RGB', {}), ('gif', 'P', {})]
+            samples += [('webp', mode, {'lossless': lossless})
+                        for mode in ['RGB', 'RGBA'] for lossless in [False, True]]
+
+            for idx, (extension, mode, params) in enumerate(samples):
+                path = os.path.join(root, '{}.{}'.format(idx, extension))
+                image = PILImage.new(mode, (300 + idx, 200 + idx))
+                if mode == 'P':
+                    image.putpalette([255 - value for value in range(256)] * 3)
+                image.save(path, **params)
+
+                with PILImage.open(path) as expected:
+                    self.assertEqual(read_header(path),
+                                     ImageHeader(expected.format, expected.mode,
+                                                 expected.width, expected.height),
+                                     (extension, mode, params))
+        finally:
+            shutil.rmtree(root)
+
+    def test_read_header_of_other_file(self):
+        self.assertIsNone(read_header(os.path.join(DATA_ROOT, 'dict.json')))
+
+
+class TestThumbnail(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.root, 'thumbnails')
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_thumbnail(self):
+        path = os.path.join(self.root, 'large.jpg')
+        PILImage.new('RGB', (1600, 1200), (255, 0, 0)).save(path)
+
+        image = PyFileInfo(path)
+        thumbnail = image.thumbnail((160, 160), cache_dir=self.cache_dir)
+        with PILImage.open(thumbnail) as rendered:
+            self.assertEqual(rendered.size, (160, 120))
+
+        umask = os.umask(0)
+        os.umask(umask)
+        self.assertEqual(stat.S_IMODE(os.stat(thumbnail).st_mode), 0o666 & ~umask)
+
+        with mock.patch('pyfileinfo.thumbnail._render') as mock_render:
+            self.assertEqual(PyFileInfo(path).thumbnail((160, 160), cache_dir=self.cache_dir),
+                             thumbnail)
+            self.assertFalse(mock_render.called)
+
+    def test_thumbnail_with_alpha(self):
+        path = os.path.join(self.root, 'alpha.png')
+        PILImage.new('RGBA', (300, 600)).save(path)
+
+        thumbnail = PyFileInfo(path).thumbnail((100, 100), cache_dir=self.cache_dir)
+        with PILImage.open(thumbnail) as rendered:
+            self.assertEqual((rendered.format, rendered.mode, rendered.size),
+                             ('PNG', 'RGBA', (50, 100)))
+
+    def test_thumbnails(self):
+        paths = [os.path.join(DATA_ROOT, '5x5.jpg'), os.path.join(DATA_ROOT, 'dict.json')]
+        results = list(Image.thumbnails(paths, (2, 2), workers=2, cache_dir=self.cache_dir))
+
+        self.assertEqual([result.path for result in results], paths)
+        self.assertTrue(os.path.exists(results[0].thumbnail))
+        self.assertIsNone(results[1].thumbnail)
+        self.assertIsNotNone(results[1].error)
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import unittest
+import subprocess
+
+from tests import DATA_ROOT
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ['PIL', 'pymediainfo', 'pycountry', 'yaml', 'concurrent.futures', 'sqlite3']
+
+
+@unittest.skipIf(sys.version_info < (3, 7), 'backends are imported eagerly before PEP 562')
+class TestLazyImport(unittest.TestCase):
+    def test_import(self):
+        self.assertEqual(self._loaded('import pyfileinfo'), [])
+
+    def test_size_and_md5(self):
+        self.assertEqual(self._loaded(
+            'from pyfileinfo import PyFileInfo\n'
+            'file = PyFileInfo({!r})\n'
+            'file.size, file.md5'.format(os.path.join(DATA_ROOT, 'dict.json'))), [])
+
+    def test_backend_on_first_access(self):
+        path = os.path.join(DATA_ROOT, '5x5.jpg')
+        self.assertEqual(self._loaded('from pyfileinfo import Image, Medium, YAML'), [])
+        self.assertEqual(self._loaded('from pyfileinfo import Image\n'
+                                      'Image({!r}).width'.format(path)), [])
+        self.assertEqual(self._loaded('from pyfileinfo import Image\n'
+                                      'Image({!r}).image'.format(path)), ['PIL'])
+
+    def test_unknown_attribute(self):
+        import pyfileinfo
+
+        with self.assertRaises(AttributeError):
+            pyfileinfo.Unknown
+
+    def _loaded(self, statement):
+        output = subprocess.check_output(
+            [sys.executable, '-c', '{}\nimport sys\nprint(" ".join(m for m in {!r} '
+                                   'if m in sys.modules))'.format(statement, HEAVY_MODULES)],
+            cwd=ROOT)
+        return output.decode().split()
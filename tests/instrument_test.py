@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from pyfileinfo import PyFileInfo, instrument
+from pyfileinfo.cache import MetadataCache
+from pyfileinfo.pyfileinfo import HEADER_SIZE
+from tests import DATA_ROOT
+
+
+class TestInstrument(unittest.TestCase):
+    def test_disabled(self):
+        self.assertFalse(instrument.enabled)
+        self.assertIsNone(instrument.start())
+
+    def test_detection(self):
+        with instrument.record(keep_events=True) as recorder:
+            self.assertTrue(instrument.enabled)
+            PyFileInfo(os.path.join(DATA_ROOT, 'dict.json')).instance
+            PyFileInfo(os.path.join(DATA_ROOT, 'mediainfo', 'pooq.xml')).instance
+
+        self.assertFalse(instrument.enabled)
+        summary = {(row['stage'], row['name']): row for row in recorder.summary()}
+        self.assertEqual(summary[('detect', 'JSON')]['count'], 1)
+        self.assertEqual(summary[('detect', 'JSON')]['failures'], 0)
+        self.assertEqual(summary[('open', 'header')]['count'], 2)
+        self.assertEqual(summary[('open', 'header')]['bytes'], 20 + HEADER_SIZE)
+
+        # An XML file is offered to YAML, which fails to parse it.
+        self.assertEqual(summary[('detect', 'YAML')]['failures'], 1)
+
+        events = recorder.events
+        self.assertEqual(len(events), sum(row['count'] for row in recorder.summary()))
+        self.assertEqual((events[0].stage, events[0].path),
+                         ('open', os.path.join(DATA_ROOT, 'dict.json')))
+        self.assertTrue(all(event.seconds >= 0 for event in events))
+        self.assertIn('detect', recorder.report())
+
+    def test_hashing_stat_and_cache(self):
+        root = tempfile.mkdtemp()
+        cache = MetadataCache(os.path.join(root, 'cache.sqlite'))
+        path = os.path.join(DATA_ROOT, 'md5_bc67678e92933a5f1c60ac5a7f65f9bb')
+        try:
+            with instrument.record() as recorder:
+                PyFileInfo(path, cache=cache).hashes(['md5', 'sha1'])
+                PyFileInfo(path, cache=cache).hashes(['md5', 'sha1'])
+                PyFileInfo(path).stat()
+        finally:
+            cache.close()
+            shutil.rmtree(root)
+
+        summary = {(row['stage'], row['name']): row for row in recorder.summary()}
+        self.assertEqual(summary[('hash', 'md5+sha1')]['count'], 1)
+        self.assertEqual(summary[('hash', 'md5+sha1')]['bytes'], 14)
+        self.assertEqual(summary[('cache', 'miss')]['count'], 1)
+        self.assertEqual(summary[('cache', 'hit')]['count'], 1)
+        # Each hashes() checks the file is still the one its digests are of.
+        self.assertEqual(summary[('stat', 'PyFileInfo.stat')]['count'], 3)
+
+    def test_observer(self):
+        events = []
+        with instrument.observe(events.append):
+            PyFileInfo(os.path.join(DATA_ROOT, 'dict.json')).md5
+
+        self.assertEqual([(event.stage, event.name, event.bytes) for event in events],
+                         [('stat', 'PyFileInfo.stat', 0), ('hash', 'md5', 20)])
+
+        PyFileInfo(os.path.join(DATA_ROOT, 'dict.json')).md5
+        self.assertEqual(len(events), 2)
@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
 
 import os
+import json
+import shutil
+import tempfile
 import unittest
 
+import mock
+
 from pyfileinfo import PyFileInfo, JSON
+from pyfileinfo.jsonstream import JSONIndex
 from tests import DATA_ROOT
 
 
@@ -23,6 +29,18 @@ class TestJSON(unittest.TestCase):
         file = PyFileInfo(os.path.join(DATA_ROOT, 'dict.json'))
         self.assertTrue(file.is_json())
 
+    def test_sniff(self):
+        self.assertTrue(JSON.sniff(b'\xef\xbb\xbf  \n{"a": 1}'))
+        self.assertTrue(JSON.sniff(b'[1, 2]'))
+        self.assertFalse(JSON.sniff(b'key: value'))
+        self.assertFalse(JSON.sniff(None))
+
+    def test_loaded_once(self):
+        with mock.patch('json.load', wraps=json.load) as mock_load:
+            file = PyFileInfo(os.path.join(DATA_ROOT, 'dict.json'))
+            self.assertEqual(file['a'], 1)
+            self.assertEqual(mock_load.call_count, 1)
+
     def test_dict_json_access(self):
         file = PyFileInfo(os.path.join(DATA_ROOT, 'dict.json'))
         self.assertEqual(file['a'], 1)
@@ -34,3 +52,63 @@ class TestJSON(unittest.TestCase):
     def test_call_dict_method(self):
         file = PyFileInfo(os.path.join(DATA_ROOT, 'dict.json'))
         self.assertEqual(len(file.items()), 2)
+
+
+class TestStreamingJSON(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.threshold = JSON.STREAMING_THRESHOLD
+        JSON.STREAMING_THRESHOLD = 0
+
+    def tearDown(self):
+        JSON.STREAMING_THRESHOLD = self.threshold
+        shutil.rmtree(self.root)
+
+    def test_indexed_array(self):
+        document = [{'id': idx, 'name': 'item [%d], "{x}" \\' % idx} for idx in range(100)]
+        file = PyFileInfo(self._write('array.json', json.dumps(document)))
+
+        with mock.patch('json.load') as mock_load:
+            self.assertTrue(file.is_json())
+            self.assertEqual(len(file), 100)
+            self.assertEqual(file[42], document[42])
+            self.assertEqual(file[-1], document[-1])
+            self.assertEqual(list(file.iterate()), document)
+            self.assertFalse(mock_load.called)
+
+    def test_indexed_object(self):
+        document = {'a': [1, 2, {'b': None}], 'c': 'd', 'e': {}}
+        file = PyFileInfo(self._write('object.json', json.dumps(document, indent=2)))
+
+        self.assertEqual(len(file), 3)
+        self.assertEqual(file['a'], document['a'])
+        self.assertEqual(dict(file.iterate()), document)
+        self.assertRaises(KeyError, lambda: file['z'])
+
+    def test_empty_containers(self):
+        self.assertEqual(len(PyFileInfo(self._write('empty.json', ' [ ] \n'))), 0)
+        self.assertEqual(len(PyFileInfo(self._write('empty.json', '{}'))), 0)
+
+    def test_scalar_document(self):
+        file = PyFileInfo(self._write('scalar.json', '"[not, an, array]"'))
+        self.assertTrue(file.is_json())
+
+    def test_invalid_documents(self):
+        for content in ['[1, 2', '[1,, 2]', '[1, 2,]', '{"a": 1,}', '{"a" 1}', '{1: 2}',
+                        '[1, 2] 3', '[1, "2]', '[{]}']:
+            path = self._write('invalid.json', content)
+            self.assertRaises(ValueError, JSONIndex.build, path)
+            self.assertFalse(PyFileInfo(path).is_json(), content)
+
+    def test_chunk_boundaries(self):
+        document = ['\\"' * 7, {'k': ['v' * 5]}, 'x']
+        path = self._write('chunks.json', json.dumps(document))
+        with mock.patch('pyfileinfo.jsonstream.CHUNK_SIZE', 3):
+            self.assertEqual(list(JSONIndex.build(path).iterate()), document)
+
+    def _write(self, name, content):
+        path = os.path.join(self.root, name)
+        with open(path, 'w') as f:
+            f.write(content)
+
+        return path
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 
 import os
+import json
+import pickle
 import unittest
 from io import open
 
@@ -20,6 +22,16 @@ class TestMedium(unittest.TestCase):
         medium = PyFileInfo(os.path.join(DATA_ROOT, 'empty.mp4'))
         self.assertTrue(medium.is_medium())
 
+    def test_sniff(self):
+        with open(os.path.join(DATA_ROOT, 'empty.mp4'), 'rb') as f:
+            self.assertTrue(Medium.sniff(f.read(4096)))
+
+        self.assertTrue(Medium.sniff(b'\x1a\x45\xdf\xa3\x01\x00\x00\x00'))
+        self.assertTrue(Medium.sniff((b'\x47' + b'\x00' * 187) * 3))
+        self.assertTrue(Medium.sniff((b'\x00' * 4 + b'\x47' + b'\x00' * 187) * 3))
+        self.assertFalse(Medium.sniff(b'\x47\x00\x00'))
+        self.assertFalse(Medium.sniff(b'\xff\xd8\xff\xe0'))
+
     def test_notitle(self):
         medium = PyFileInfo(os.path.join(DATA_ROOT, 'empty.mp4'))
         self.assertIsNone(medium.title)
@@ -139,6 +151,84 @@ class TestMedium(unittest.TestCase):
         self.assertEqual(medium.subtitle_tracks[0].streamorder, 7)
         self.assertEqual(medium.subtitle_tracks[1].streamorder, 8)
 
+    @mock.patch('pymediainfo.MediaInfo.parse')
+    @mock.patch('os.path.getsize')
+    def test_track_attributes_as_reported(self, mock_size, mock_mediainfo):
+        self._set_mediainfo_as_pooq(mock_size, mock_mediainfo)
+
+        medium = PyFileInfo('pooq.mp4')
+        video_track, audio_track = medium.video_tracks[0], medium.audio_tracks[0]
+        self.assertEqual(video_track.duration, 5022384)
+        self.assertEqual(video_track.frame_count, '150521')
+        self.assertEqual(video_track.stream_id, '0')
+        self.assertEqual(video_track.stream_identifier, '0')
+        self.assertEqual(video_track.track_type, 'Video')
+        self.assertEqual(video_track.bit_rate, 4735792)
+        self.assertEqual(audio_track.channel_s, 2)
+        self.assertEqual(audio_track.frame_rate, '46.875')
+        self.assertEqual(medium.subtitle_tracks[0].track_type, 'Text')
+        self.assertIsNone(video_track.not_reported)
+        self.assertRaises(AttributeError, getattr, video_track, 'other_display_aspect_ratio')
+
+        self._set_mediainfo_as_starwars_ep3(mock_size, mock_mediainfo)
+        audio_track = PyFileInfo('starwars-ep3.mp4').audio_tracks[0]
+        self.assertEqual(audio_track.channel_s, '7 / 6')
+        self.assertEqual(audio_track.stream_id, 0)
+        self.assertEqual(audio_track.duration, 8405888)
+
+    @mock.patch('pymediainfo.MediaInfo.parse')
+    @mock.patch('os.path.getsize')
+    def test_mediainfo_parsed_once(self, mock_size, mock_mediainfo):
+        self._set_mediainfo_as_pooq(mock_size, mock_mediainfo)
+
+        medium = PyFileInfo('pooq.mp4')
+        self.assertTrue(isinstance(medium.instance, Medium))
+        self.assertEqual(medium.duration, 5022.400)
+        self.assertEqual(mock_mediainfo.call_count, 1)
+
+    @mock.patch('pymediainfo.MediaInfo.parse')
+    @mock.patch('os.path.getsize')
+    def test_record(self, mock_size, mock_mediainfo):
+        self._set_mediainfo_as_starwars_ep3(mock_size, mock_mediainfo)
+
+        record = Medium('starwars-ep3.mp4').record
+        self.assertEqual(record.duration, 8405.888)
+        self.assertEqual(record.video_tracks[0].frame_rate, 23.976)
+        self.assertEqual(record.video_tracks[0].display_aspect_ratio, '16:9')
+        self.assertEqual(record.audio_tracks[0].language, 'en')
+        self.assertEqual(record.audio_tracks[0].get('compression_mode'), 'Lossless / Lossy')
+        self.assertIsNone(record.audio_tracks[0].get('other_language'))
+        self.assertEqual(len(record.chapters), 50)
+        self.assertEqual(record.chapters[1].start, 23.523)
+
+        self.assertEqual(pickle.loads(pickle.dumps(record)), record)
+        metadata = json.loads(json.dumps(Medium('starwars-ep3.mp4', record).metadata()))
+        restored = Medium.from_metadata('starwars-ep3.mp4', metadata)
+        self.assertEqual(restored.record, record)
+        self.assertEqual(restored.audio_tracks[0].language.name, 'English')
+        self.assertEqual(mock_mediainfo.call_count, 1)
+
+    def test_covers(self):
+        self.assertTrue(Medium.covers({'profile': 'full'}, 'header'))
+        self.assertTrue(Medium.covers({'profile': 'default'}, None))
+        self.assertFalse(Medium.covers({'profile': 'header'}, None))
+        self.assertFalse(Medium.covers({}, 'header'))
+
+    @mock.patch('pymediainfo.MediaInfo.parse')
+    @mock.patch('os.path.getsize')
+    def test_profile(self, mock_size, mock_mediainfo):
+        self._set_mediainfo_as_pooq(mock_size, mock_mediainfo)
+
+        self.assertEqual(PyFileInfo('pooq.mp4').duration, 5022.400)
+        self.assertEqual(mock_mediainfo.call_args, mock.call('pooq.mp4', parse_speed=0.5))
+
+        self.assertEqual(PyFileInfo('pooq.mp4', profile='header').duration, 5022.400)
+        self.assertEqual(mock_mediainfo.call_args,
+                         mock.call('pooq.mp4', parse_speed=0,
+                                   mediainfo_options={'File_TestContinuousFileNames': '0'}))
+
+        self.assertRaises(ValueError, Medium, 'pooq.mp4', profile='deep')
+
     def _set_mediainfo_as_pooq(self, mock_size, mock_mediainfo):
         xml_path = os.path.join(DATA_ROOT, 'mediainfo/pooq.xml')
         media_xml = open(xml_path, encoding='utf-8').read()
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import pickle
+import unittest
+import multiprocessing
+
+import mock
+
+from pyfileinfo import Medium
+from pyfileinfo import probe
+from tests import DATA_ROOT
+
+
+if hasattr(multiprocessing, 'get_start_method'):
+    START_METHOD = multiprocessing.get_start_method()
+else:  # Python 2 forks, except on Windows.
+    START_METHOD = 'spawn' if os.name == 'nt' else 'fork'
+
+
+class TestProbeMany(unittest.TestCase):
+    def test_probe_many(self):
+        paths = [os.path.join(DATA_ROOT, name) for name in ['empty.mp4', 'dict.json', 'nothing']]
+        results = list(Medium.probe_many(paths, workers=2))
+
+        self.assertEqual([result.path for result in results], paths)
+        self.assertEqual(results[0].medium().duration, 5.047)
+        self.assertIsNone(results[1].metadata)
+        self.assertIsNone(results[1].error)
+        self.assertIsNone(results[2].metadata)
+        self.assertIn('No such file', results[2].error)
+        self.assertEqual(pickle.loads(pickle.dumps(results[0])), results[0])
+
+    @unittest.skipUnless(START_METHOD == 'fork',
+                         'workers must inherit the mock')
+    def test_crash_and_timeout(self):
+        original = probe._probe
+
+        def _probe(path, profile):
+            if path == 'crash':
+                os._exit(3)
+            if path == 'hang':
+                time.sleep(60)
+
+            return original(path, profile)
+
+        with mock.patch('pyfileinfo.probe._probe', _probe):
+            paths = ['crash', 'hang', os.path.join(DATA_ROOT, 'empty.mp4')]
+            results = {result.path: result
+                       for result in Medium.probe_many(paths, workers=1, timeout=1, ordered=False)}
+
+        self.assertIn('exited with code 3', results['crash'].error)
+        self.assertIn('timed out', results['hang'].error)
+        self.assertIsNotNone(results[paths[2]].metadata)
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+
+import mock
+
+from pyfileinfo import PyFileInfo, File, Directory, Image, JSON, Medium, YAML, registry
+from tests import DATA_ROOT
+
+
+class CSV(File):
+    @staticmethod
+    def hint():
+        return ['.csv']
+
+    @staticmethod
+    def sniff(header):
+        return False
+
+
+class TestRegistry(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        registry.unregister(CSV)
+        shutil.rmtree(self.root)
+
+    def test_builtin_order(self):
+        self.assertEqual(registry.backends(), (Directory, Image, JSON, Medium, YAML))
+
+    def test_detection_order(self):
+        self.assertEqual(registry.detection_order('.yml'), (YAML, Directory, Image, JSON, Medium))
+        self.assertEqual(registry.detection_order('.jpg')[0], Image)
+        self.assertEqual(registry.detection_order(''), registry.backends())
+
+    def test_find_and_predicate(self):
+        self.assertIs(registry.find('Medium'), Medium)
+        self.assertIsNone(registry.find('CSV'))
+        self.assertIs(registry.predicate('is_json'), JSON)
+        self.assertIsNone(registry.predicate('duration'))
+
+    def test_register(self):
+        path = os.path.join(self.root, 'table.csv')
+        with open(path, 'w') as f:
+            f.write('a,b\n1,2\n')
+
+        registry.register(CSV, priority=100)
+        self.assertEqual(registry.backends()[0], CSV)
+        self.assertEqual(registry.detection_order('.csv')[0], CSV)
+        self.assertTrue(PyFileInfo(path).is_csv())
+        self.assertIsInstance(PyFileInfo(path).instance, CSV)
+
+        registry.unregister(CSV)
+        self.assertNotIn(CSV, registry.backends())
+        self.assertNotIsInstance(PyFileInfo(path).instance, CSV)
+        with self.assertRaises(AttributeError):
+            PyFileInfo(os.path.join(DATA_ROOT, 'dict.json')).is_csv
+
+    def test_register_below_priority(self):
+        registry.register(CSV)
+        self.assertEqual(registry.backends()[-1], CSV)
+
+        # The extension still puts it ahead of any other backend.
+        self.assertEqual(registry.detection_order('.csv')[0], CSV)
+
+    def test_entry_points(self):
+        entry_point = mock.Mock()
+        entry_point.name = 'csv'
+        entry_point.load.return_value = CSV
+
+        broken = mock.Mock()
+        broken.name = 'broken'
+        broken.load.side_effect = ImportError('no module named broken')
+
+        with mock.patch.object(registry, '_loaded', False), \
+                mock.patch.object(registry, '_entry_points', return_value=[entry_point, broken]):
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter('always')
+                registry.backends()
+
+        self.assertIs(registry.find('CSV'), CSV)
+        self.assertEqual([warning.category for warning in caught], [RuntimeWarning])
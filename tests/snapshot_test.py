@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from pyfileinfo import PyFileInfo
+from pyfileinfo.file import mtime_ns
+from pyfileinfo.snapshot import Snapshot, SnapshotDiff, diff
+from tests import DATA_ROOT
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        shutil.copytree(DATA_ROOT, os.path.join(self.root, 'data'))
+        self.path = os.path.join(self.root, 'data')
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_snapshot(self):
+        snapshot = PyFileInfo(self.path).snapshot()
+        self.assertEqual(len(snapshot), 15)
+        self.assertIn('dict.json', snapshot)
+        self.assertNotIn('.hidden', snapshot)
+
+        entry = snapshot.get(os.path.join('text_files', 'same.txt'))
+        stat = os.stat(os.path.join(self.path, 'text_files', 'same.txt'))
+        self.assertEqual(entry, (os.path.join('text_files', 'same.txt'), stat.st_dev,
+                                 stat.st_ino, 3, mtime_ns(stat), 'YAML'))
+        self.assertEqual(snapshot.get('5x5.jpg').type, 'Image')
+        self.assertEqual(snapshot.get('mediainfo').type, 'Directory')
+        self.assertIsNone(snapshot.get('missing'))
+
+    def test_dump_and_load(self):
+        snapshot = PyFileInfo(self.path).snapshot(include_hidden_file=True)
+        f = io.StringIO()
+        snapshot.dump(f)
+        f.seek(0)
+
+        loaded = Snapshot.load(f)
+        self.assertEqual(loaded.root, snapshot.root)
+        self.assertEqual(list(loaded), list(snapshot))
+        self.assertEqual(diff(snapshot, loaded), SnapshotDiff([], [], [], []))
+
+        with self.assertRaises(ValueError):
+            Snapshot.load(io.StringIO(u'{"version": 0}'))
+
+    def test_diff(self):
+        old = PyFileInfo(self.path).snapshot()
+
+        os.rename(os.path.join(self.path, 'dict.json'), os.path.join(self.path, 'moved.json'))
+        os.rename(os.path.join(self.path, 'mediainfo'), os.path.join(self.path, 'xml'))
+        os.remove(os.path.join(self.path, 'list.yml'))
+        with open(os.path.join(self.path, 'list.json'), 'w') as f:
+            f.write('{"key": "value"}')
+        with open(os.path.join(self.path, 'new.json'), 'w') as f:
+            f.write('[]')
+
+        new = PyFileInfo(self.path).snapshot(previous=old)
+        self.assertEqual(diff(old, new), SnapshotDiff(
+            added=['new.json'],
+            removed=['list.yml'],
+            modified=['list.json'],
+            renamed=[('dict.json', 'moved.json'), ('mediainfo', 'xml'),
+                     (os.path.join('mediainfo', 'pooq.xml'), os.path.join('xml', 'pooq.xml')),
+                     (os.path.join('mediainfo', 'star_wars_e_3.xml'),
+                      os.path.join('xml', 'star_wars_e_3.xml'))]))
+        self.assertEqual(new.get('moved.json').type, 'JSON')
+
+    def test_only_changed_entries_are_probed(self):
+        old = PyFileInfo(self.path).snapshot()
+        os.rename(os.path.join(self.path, '5x5.jpg'), os.path.join(self.path, 'moved.jpg'))
+        with open(os.path.join(self.path, 'new.json'), 'w') as f:
+            f.write('[]')
+
+        probed = []
+        detect = PyFileInfo._detect
+
+        def record(file):
+            probed.append(file.name)
+            return detect(file)
+
+        with mock.patch.object(PyFileInfo, '_detect', autospec=True, side_effect=record):
+            new = Snapshot.build(self.path, previous=old)
+
+        self.assertEqual(probed, ['new.json'])
+        self.assertEqual(new.get('moved.jpg').type, 'Image')
+        self.assertEqual(new.get('new.json').type, 'JSON')
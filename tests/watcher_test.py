@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+from pyfileinfo import PyFileInfo
+
+
+@unittest.skipUnless(sys.platform.startswith('linux'), 'requires inotify')
+class TestWatcher(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self._write('list.json', '[1, 2]')
+        os.mkdir(os.path.join(self.root, 'sub'))
+
+        self.watcher = PyFileInfo(self.root).watch(settle_time=0.2)
+        self.watcher.start()
+
+    def tearDown(self):
+        self.watcher.close()
+        shutil.rmtree(self.root)
+
+    def test_index(self):
+        self.assertEqual(sorted(self.watcher.index), [os.path.join(self.root, 'list.json'),
+                                                      os.path.join(self.root, 'sub')])
+        self.assertEqual(self.watcher.poll(0), [])
+
+    def test_created_once_settled(self):
+        with open(os.path.join(self.root, 'dict.json'), 'w') as f:
+            f.write('{"key": ')
+            f.flush()
+            self.assertEqual(self.watcher.poll(0.05), [])
+
+            f.write('"value"}')
+
+        event, = self.watcher.poll(1)
+        self.assertEqual(event[:4], ('created', os.path.join(self.root, 'dict.json'), None, False))
+        self.assertTrue(event.file.is_json())
+        self.assertEqual(event.file['key'], 'value')
+        self.assertIs(self.watcher.index[event.path], event.file)
+
+    def test_settles_without_close(self):
+        with open(os.path.join(self.root, 'partial.bin'), 'wb') as f:
+            f.write(b'\x00')
+            f.flush()
+
+            event, = self.watcher.poll(1)
+            self.assertEqual(event.kind, 'created')
+
+    def test_modified_and_deleted(self):
+        self._write('list.json', '[1, 2, 3]')
+        event, = self.watcher.poll(1)
+        self.assertEqual(event.kind, 'modified')
+        self.assertEqual(len(event.file), 3)
+
+        os.remove(os.path.join(self.root, 'list.json'))
+        event, = self.watcher.poll(1)
+        self.assertEqual(event[:2], ('deleted', os.path.join(self.root, 'list.json')))
+        self.assertNotIn(event.path, self.watcher.index)
+
+    def test_created_then_deleted_is_not_reported(self):
+        with open(os.path.join(self.root, 'temporary'), 'wb') as f:
+            f.write(b'\x00')
+            f.flush()
+            os.remove(os.path.join(self.root, 'temporary'))
+
+        self.assertEqual(self.watcher.poll(0.5), [])
+
+    def test_new_directory(self):
+        os.makedirs(os.path.join(self.root, 'new', 'nested'))
+        self._write(os.path.join('new', 'nested', 'a.txt'), 'a')
+
+        events = self.watcher.poll(1) + self.watcher.poll(0.5)
+        self.assertEqual(sorted((event.kind, event.path) for event in events), [
+            ('created', os.path.join(self.root, 'new')),
+            ('created', os.path.join(self.root, 'new', 'nested')),
+            ('created', os.path.join(self.root, 'new', 'nested', 'a.txt')),
+        ])
+
+        self._write(os.path.join('new', 'nested', 'a.txt'), 'b')
+        event, = self.watcher.poll(1)
+        self.assertEqual(event[:2], ('modified', os.path.join(self.root, 'new', 'nested', 'a.txt')))
+
+    def test_moves(self):
+        os.rename(os.path.join(self.root, 'list.json'), os.path.join(self.root, 'sub', 'l.json'))
+        event, = self.watcher.poll(1)
+        self.assertEqual(event[:3], ('moved', os.path.join(self.root, 'sub', 'l.json'),
+                                     os.path.join(self.root, 'list.json')))
+
+        os.rename(os.path.join(self.root, 'sub'), os.path.join(self.root, 'moved'))
+        event, = self.watcher.poll(1)
+        self.assertEqual(event[:4], ('moved', os.path.join(self.root, 'moved'),
+                                     os.path.join(self.root, 'sub'), True))
+        self.assertEqual(sorted(self.watcher.index), [os.path.join(self.root, 'moved'),
+                                                      os.path.join(self.root, 'moved', 'l.json')])
+
+        # The moved directory is still watched under its new path.
+        self._write(os.path.join('moved', 'l.json'), '[]')
+        event, = self.watcher.poll(1)
+        self.assertEqual(event[:2], ('modified', os.path.join(self.root, 'moved', 'l.json')))
+
+        outside = tempfile.mkdtemp()
+        try:
+            os.rename(os.path.join(self.root, 'moved'), os.path.join(outside, 'moved'))
+            event, = self.watcher.poll(1)
+            self.assertEqual(event[:2], ('deleted', os.path.join(self.root, 'moved')))
+            self.assertEqual(self.watcher.index, {})
+        finally:
+            shutil.rmtree(outside)
+
+    def test_directory_moved_while_writing(self):
+        os.mkdir(os.path.join(self.root, 'd'))
+        self.assertEqual(self.watcher.poll(0.1)[0].path, os.path.join(self.root, 'd'))
+
+        with open(os.path.join(self.root, 'd', 'a.bin'), 'wb') as f:
+            f.write(b'\x00')
+            f.flush()
+            self.assertEqual(self.watcher.poll(0.05), [])
+
+            os.rename(os.path.join(self.root, 'd'), os.path.join(self.root, 'e'))
+            event, = self.watcher.poll(0.05)
+            self.assertEqual(event[:2], ('moved', os.path.join(self.root, 'e')))
+
+            # Settles while still open, so nothing reports it under its new path but the move.
+            event, = self.watcher.poll(1)
+            self.assertEqual(event[:2], ('created', os.path.join(self.root, 'e', 'a.bin')))
+            self.assertIn(event.path, self.watcher.index)
+
+    def test_resync(self):
+        # As if the kernel's queue overflowed while the file was written.
+        with open(os.path.join(self.root, 'list.json'), 'a') as f:
+            f.write(' ')
+        os.utime(os.path.join(self.root, 'list.json'), (1000000000, 1000000000))
+        os.read(self.watcher.fileno(), 64 * 1024)
+
+        self.watcher._resync()
+        event, = self.watcher.poll(1)
+        self.assertEqual(event[:2], ('modified', os.path.join(self.root, 'list.json')))
+
+    def _write(self, name, content):
+        with open(os.path.join(self.root, name), 'w') as f:
+            f.write(content)
@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 
 import os
+import shutil
+import tempfile
 import unittest
 
+import mock
+
 from pyfileinfo import PyFileInfo, YAML
 from tests import DATA_ROOT
 
@@ -34,3 +38,43 @@ class TestYAML(unittest.TestCase):
     def test_call_dict_method(self):
         file = PyFileInfo(os.path.join(DATA_ROOT, 'dict.yml'))
         self.assertEqual(len(file.items()), 2)
+
+    def test_loaded_once(self):
+        import yaml
+
+        with mock.patch('yaml.load_all', side_effect=yaml.load_all) as mock_load_all:
+            file = PyFileInfo(os.path.join(DATA_ROOT, 'dict.yml'))
+            self.assertTrue(isinstance(file.instance, YAML))
+            self.assertEqual(len(file.items()), 2)
+            self.assertEqual(mock_load_all.call_count, 1)
+
+    @mock.patch.object(YAML, 'STREAMING_THRESHOLD', 0)
+    def test_large_file_validation_does_not_construct(self):
+        with mock.patch('yaml.load_all') as mock_load_all:
+            self.assertTrue(PyFileInfo(os.path.join(DATA_ROOT, 'dict.yml')).is_yaml())
+            self.assertFalse(mock_load_all.called)
+
+    def test_documents(self):
+        root = tempfile.mkdtemp()
+        try:
+            path = os.path.join(root, 'stream.yml')
+            with open(path, 'w') as f:
+                f.write('---\na: 1\n---\n- b\n---\nc\n')
+
+            file = PyFileInfo(path)
+            self.assertTrue(file.is_yaml())
+            self.assertEqual(list(file.documents()), [{'a': 1}, ['b'], 'c'])
+            self.assertEqual(file[1], ['b'])
+        finally:
+            shutil.rmtree(root)
+
+    def test_invalid_yaml(self):
+        root = tempfile.mkdtemp()
+        try:
+            path = os.path.join(root, 'invalid.yml')
+            with open(path, 'w') as f:
+                f.write('a: [1, 2\nb: }\n')
+
+            self.assertFalse(PyFileInfo(path).is_yaml())
+        finally:
+            shutil.rmtree(root)